@@ -1,5 +1,6 @@
 # app/app.py
 import json
+import os
 from io import BytesIO
 from pathlib import Path
 from typing import Optional
@@ -15,11 +16,13 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 # ---------------------------------------------------------------
 
-from src.crypto.keys import gen_rsa_3072, gen_ecc_p256
+from src.crypto.keypool import KeyPool
 from src.crypto.signature import sign_file, verify_file
-from src.pipeline.bind import build_payload, parse_payload
+from src.pipeline.bind import build_payload, is_payload, parse_payload
+from src.pipeline.batch import check_images
 from src.watermark import lsb as wm_lsb
 from src.watermark import dct as wm_dct
+from src.watermark import detect as wm_detect
 
 st.set_page_config(page_title="Secure Auth + Watermark", layout="wide")
 st.title("🔐 Secure Content Authentication: Signatures + Watermarking")
@@ -27,6 +30,17 @@ st.title("🔐 Secure Content Authentication: Signatures + Watermarking")
 # -------------------------
 # Helpers
 # -------------------------
+@st.cache_resource
+def key_pool(scheme: str) -> KeyPool:
+    """One background-refilled keypair pool per scheme, shared across sessions."""
+    passphrase = os.environ.get("SCA_KEYPOOL_PASSPHRASE")
+    return KeyPool(
+        Path(".keypool"),
+        scheme=scheme,
+        depth=int(os.environ.get("SCA_KEYPOOL_DEPTH", "4")),
+        passphrase=passphrase.encode() if passphrase else None,
+    ).start()
+
 def pil_to_png_bytes(img: Image.Image) -> bytes:
     b = BytesIO()
     img.save(b, "PNG")
@@ -48,7 +62,7 @@ def save_and_show(path: Path, caption: str):
 def verify_and_extract(
     img_path: Path,
     wm_scheme: str,
-    bits: int = 512,
+    bits: Optional[int] = None,
     sig_path: Optional[Path] = None,
     pub_path: Optional[Path] = None,
     block_key: str = "",
@@ -70,8 +84,13 @@ def verify_and_extract(
 
     with cols[1]:
         try:
-            if wm_scheme == "lsb":
+            if wm_scheme == "auto":
+                found, raw = wm_detect.extract_auto(img_path, validate=is_payload)
+                st.caption(f"Detected scheme: {found}")
+            elif wm_scheme == "lsb":
                 raw = wm_lsb.extract(img_path)
+            elif bits is None:
+                raw = wm_dct.extract_bytes(img_path)
             else:
                 bits_arr = wm_dct.extract(img_path, bits)
                 raw = np.packbits(bits_arr).tobytes()
@@ -101,19 +120,24 @@ tab_keys, tab_flow = st.tabs(["Keys", "Workflow"])
 # -------------------------
 with tab_keys:
     st.header("Key Generation")
+    if not os.environ.get("SCA_KEYPOOL_PASSPHRASE"):
+        st.warning(
+            "SCA_KEYPOOL_PASSPHRASE is not set: pre-generated private keys are stored "
+            "unencrypted in ./.keypool/. Set it to encrypt them at rest."
+        )
     scheme = st.selectbox("Signature Scheme", ["rsa", "ecc"], index=0, key="sig_scheme")
     c1, c2 = st.columns(2)
     with c1:
         if st.button("Generate Keys"):
-            if scheme == "rsa":
-                priv, pub = gen_rsa_3072()
-            else:
-                priv, pub = gen_ecc_p256()
+            priv, pub = key_pool(scheme).get()
             Path("private.pem").write_bytes(priv)
             Path("public.pem").write_bytes(pub)
             st.success("Keys saved: private.pem, public.pem")
     with c2:
         st.caption("Current: " + ("RSA-3072" if scheme == "rsa" else "ECC P-256"))
+        st.caption(f"Pre-generated keys ready: {key_pool(scheme).size()}")
+        if key_pool(scheme).last_error:
+            st.warning(f"Key pool refill failing ({key_pool(scheme).failures}x): {key_pool(scheme).last_error}")
         if Path("public.pem").exists():
             st.download_button("⬇️ public.pem", data=Path("public.pem").read_bytes(), file_name="public.pem", key="dl_pub_pem")
         if Path("private.pem").exists():
@@ -178,8 +202,7 @@ with tab_flow:
                 if wm_scheme == "lsb":
                     wm_lsb.embed(img_path, payload, out_png)
                 else:
-                    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
-                    wm_dct.embed(img_path, bits, out_png)
+                    wm_dct.embed_bytes(img_path, payload, out_png)
                 st.success("Watermark embedded → out_wm.png")
                 save_and_show(out_png, "Watermarked")
 
@@ -232,7 +255,7 @@ with tab_flow:
         with st.expander("Open testcase verifier", expanded=True):
             st.caption("Upload the signature (.sig) created for the original watermarked image, then upload any number of PNG test images you edited (brightness/crop/etc.). We will verify each image with the signature and attempt watermark extraction.")
             up_sig = st.file_uploader("Upload signature (.sig)", type=None, key="tc_sig")
-            wm_scheme_tc = st.selectbox("Watermark Scheme used to embed (for extraction)", ["lsb","dct"], index=0, key="tc_scheme")
+            wm_scheme_tc = st.selectbox("Watermark Scheme used to embed (for extraction)", ["auto","lsb","dct"], index=0, key="tc_scheme")
             tests = st.file_uploader("Upload one or more PNG test images", type=["png"], accept_multiple_files=True, key="tc_imgs")
 
             # Save the uploaded signature to disk if provided
@@ -253,41 +276,61 @@ with tab_flow:
                 else:
                     st.warning("Generate/Upload public.pem first in Keys tab.")
 
-            # Process each test image
+            # Process test images in a worker pool (signature + key loaded once)
             if tests and tc_sig_path:
                 st.markdown("---")
                 st.subheader("Results per test image")
+                pub_pem_path = Path("public.pem")
+                if not pub_pem_path.exists():
+                    st.warning("Generate/Upload public.pem first in Keys tab.")
+                tc_sig = tc_sig_path.read_bytes()
+                tc_pub = pub_pem_path.read_bytes() if pub_pem_path.exists() else None
+
+                tc_paths = []
                 for idx, f in enumerate(tests):
                     p = Path(f"_tc_{idx}.png")
                     p.write_bytes(f.read())
-                    st.image(Image.open(p), caption=f"Test image {idx+1}: {p.name}", use_container_width=True)
+                    tc_paths.append(p)
 
-                    # Verify signature against this test image using the provided signature
-                    if Path("public.pem").exists():
-                        ok = verify_file(p, tc_sig_path.read_bytes(), Path("public.pem").read_bytes(), algo=st.session_state.get("sig_scheme","rsa"))
-                        st.write(f"Signature verify: **{'OK' if ok else 'FAIL'}**")
-                    else:
-                        st.warning("Generate/Upload public.pem first in Keys tab.")
-
-                    # Extract watermark according to selected scheme
-                    try:
-                        if wm_scheme_tc == "lsb":
-                            raw = wm_lsb.extract(p)
+                summary_slot = st.empty()
+                progress = st.progress(0.0, text=f"Verifying 0/{len(tc_paths)}")
+                slots = [st.container() for _ in tc_paths]
+                rows = []
+                for res in check_images(
+                    tc_paths, tc_sig, tc_pub,
+                    algo=st.session_state.get("sig_scheme", "rsa"),
+                    scheme=wm_scheme_tc,
+                ):
+                    idx = res["idx"]
+                    p = tc_paths[idx]
+                    with slots[idx]:
+                        st.image(Image.open(p), caption=f"Test image {idx+1}: {p.name}", use_container_width=True)
+                        if res["verify"] is not None:
+                            st.write(f"Signature verify: **{'OK' if res['verify'] else 'FAIL'}**")
+                        if wm_scheme_tc == "auto" and res["meta"] is not None:
+                            st.caption(f"Detected scheme: {res['scheme']}")
+                        if res["meta"] is not None:
+                            st.code(json.dumps(res["meta"], indent=2))
                         else:
-                            bits_arr = wm_dct.extract(p, 512)
-                            raw = np.packbits(bits_arr).tobytes()
-                        meta = parse_payload(raw)
-                        st.code(json.dumps(meta, indent=2))
-                    except Exception as e:
-                        st.warning(f"Watermark not decodable or not JSON: {e}")
-
-                    st.download_button(
-                        label=f"⬇️ Download this test image ({p.name})",
-                        data=p.read_bytes(),
-                        file_name=p.name,
-                        use_container_width=True,
-                        key=f"dl_tc_{idx}"
-                    )
-                    st.markdown("---")
+                            st.warning(f"Watermark not decodable or not JSON: {res['error']}")
+                        st.caption(f"verify {res['verify_ms']:.1f} ms · extract {res['extract_ms']:.1f} ms")
+                        st.download_button(
+                            label=f"⬇️ Download this test image ({p.name})",
+                            data=p.read_bytes(),
+                            file_name=p.name,
+                            use_container_width=True,
+                            key=f"dl_tc_{idx}"
+                        )
+                        st.markdown("---")
+                    rows.append({
+                        "#": idx + 1,
+                        "file": res["file"],
+                        "signature": "-" if res["verify"] is None else ("OK" if res["verify"] else "FAIL"),
+                        "watermark": res["scheme"] if res["meta"] is not None else "FAIL",
+                        "verify_ms": round(res["verify_ms"], 1),
+                        "extract_ms": round(res["extract_ms"], 1),
+                    })
+                    progress.progress(len(rows) / len(tc_paths), text=f"Verifying {len(rows)}/{len(tc_paths)}")
+                summary_slot.dataframe(sorted(rows, key=lambda r: r["#"]), use_container_width=True, hide_index=True)
             elif tests and not up_sig:
                 st.warning("Please upload the signature (.sig) created for the original watermarked file.")
@@ -13,7 +13,7 @@ echo "Signature verify (should FAIL):"
 python -m src.cli verify tampered_soft.png --algo rsa --sig out_wm.sig || true
 
 echo "DCT extract (maybe OK if DCT used):"
-python -m src.cli extract tampered_soft.png --scheme dct --bits 512 || true
+python -m src.cli extract tampered_soft.png --scheme dct || true
 
 # Aggressive tamper via JPEG roundtrip
 python - <<'PY'
@@ -30,4 +30,4 @@ echo "LSB extract (likely FAIL):"
 python -m src.cli extract tampered_hard.png --scheme lsb || true
 
 echo "DCT extract (may or may not succeed depending on strength):"
-python -m src.cli extract tampered_hard.png --scheme dct --bits 512 || true
+python -m src.cli extract tampered_hard.png --scheme dct || true
@@ -1,14 +1,19 @@
 from __future__ import annotations
 import json
+import time
 from pathlib import Path
+from typing import Optional
 import click
 import numpy as np
 
 from src.crypto.keys import gen_rsa_3072, gen_ecc_p256, save_key
 from src.crypto.signature import sign_file, verify_file
-from src.pipeline.bind import build_payload, parse_payload
+from src.crypto import merkle
+from src.pipeline.bind import build_payload, is_payload, parse_payload
+from src.pipeline.watch import Watcher
 from src.watermark import lsb as wm_lsb
 from src.watermark import dct as wm_dct
+from src.watermark import detect as wm_detect
 
 @click.group()
 def cli():
@@ -49,6 +54,47 @@ def verify(file: Path, pub: Path, algo: str, sig: Path):
     ok = verify_file(file, sig.read_bytes(), pub.read_bytes(), algo=algo)
     click.echo("VERIFY: OK" if ok else "VERIFY: FAIL")
 
+@cli.command("sign-chunked")
+@click.argument("file", type=click.Path(path_type=Path))
+@click.option("--priv", type=click.Path(path_type=Path), default=Path("private.pem"))
+@click.option("--algo", type=click.Choice(["rsa", "ecc"]), default="rsa")
+@click.option("--chunk-size", type=click.IntRange(min=1), default=merkle.CHUNK_SIZE, show_default=True)
+@click.option("--out", type=click.Path(path_type=Path), default=Path("file.sig"))
+@click.option("--sidecar", type=click.Path(path_type=Path), default=Path("file.merkle.json"))
+def sign_chunked(file: Path, priv: Path, algo: str, chunk_size: int, out: Path, sidecar: Path):
+    """Sign the Merkle root of a file's chunks (chunk hashes go to a sidecar)."""
+    sig, side = merkle.sign_file_chunked(file, priv.read_bytes(), algo=algo, chunk_size=chunk_size)
+    out.write_bytes(sig)
+    merkle.save_sidecar(side, sidecar)
+    click.echo(f"Signature → {out} | chunks ({len(side['leaves'])}) → {sidecar}")
+
+@cli.command("verify-range")
+@click.argument("file", type=click.Path(path_type=Path))
+@click.option("--pub", type=click.Path(path_type=Path), default=Path("public.pem"))
+@click.option("--sig", type=click.Path(path_type=Path), default=Path("file.sig"))
+@click.option("--sidecar", type=click.Path(path_type=Path), default=Path("file.merkle.json"))
+@click.option("--start", type=int, default=0, help="First byte of range")
+@click.option("--end", type=int, default=None, help="End of range (exclusive); default: end of file")
+@click.option("--scan", is_flag=True, help="Hash every chunk in parallel and list corrupt chunks")
+def verify_range(file: Path, pub: Path, sig: Path, sidecar: Path, start: int, end, scan: bool):
+    """Verify a byte range of a chunk-signed file."""
+    side = merkle.load_sidecar(sidecar)
+    if scan:
+        try:
+            bad = merkle.find_corrupt_chunks(file, sig.read_bytes(), side, pub.read_bytes())
+        except ValueError as e:
+            click.echo(f"VERIFY: FAIL ({e})")
+            return
+        click.echo(f"CORRUPT CHUNKS: {bad}" if bad else "VERIFY: OK")
+        return
+    end = side["size"] if end is None else end
+    try:
+        ok = merkle.verify_range(file, start, end, sig.read_bytes(), side, pub.read_bytes())
+    except ValueError as e:
+        click.echo(f"VERIFY: FAIL ({e})")
+        return
+    click.echo("VERIFY: OK" if ok else "VERIFY: FAIL")
+
 @cli.command()
 @click.argument("image", type=click.Path(path_type=Path))
 @click.option("--scheme", type=click.Choice(["lsb", "dct"]), default="lsb")
@@ -56,24 +102,39 @@ def verify(file: Path, pub: Path, algo: str, sig: Path):
 @click.option("--algo", type=click.Choice(["rsa", "ecc"]), default="rsa")
 @click.option("--out", type=click.Path(path_type=Path), default=Path("out_wm.png"))
 @click.option("--extra", type=str, default="{}", help="JSON string of extra metadata")
-def embed(image: Path, scheme: str, signer: str, algo: str, out: Path, extra: str):
+@click.option("--bits-per-block", type=click.IntRange(1, len(wm_dct.PAIRS)), default=1,
+              help="For DCT embedding: coefficient pairs (bits) used per block")
+@click.option("--lsb-channels", type=click.Choice(["R", "G", "B", "RG", "GB", "RB", "RGB"]), default="B",
+              help="For LSB embedding: channels carrying the payload")
+@click.option("--lsb-bits", type=click.IntRange(1, 2), default=1, help="For LSB embedding: low bits used per channel")
+def embed(image: Path, scheme: str, signer: str, algo: str, out: Path, extra: str, bits_per_block: int,
+          lsb_channels: str, lsb_bits: int):
     """Embed watermark payload into image."""
     payload = build_payload(image, signer, algo, json.loads(extra))
     if scheme == "lsb":
-        wm_lsb.embed(image, payload, out)
+        wm_lsb.embed(image, payload, out, channels=lsb_channels, bits=lsb_bits)
     else:
-        bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
-        wm_dct.embed(image, bits, out)
+        wm_dct.embed_bytes(image, payload, out, bits_per_block=bits_per_block)
     click.echo(f"Embedded watermark → {out}")
 
 @cli.command()
 @click.argument("image", type=click.Path(path_type=Path))
-@click.option("--scheme", type=click.Choice(["lsb", "dct"]), default="lsb")
-@click.option("--bits", type=int, default=512, help="For DCT extraction: number of bits")
-def extract(image: Path, scheme: str, bits: int):
+@click.option("--scheme", type=click.Choice(["auto", "lsb", "dct"]), default="lsb")
+@click.option("--bits", type=int, default=None,
+              help="For DCT extraction: read this many raw bits (no length header)")
+def extract(image: Path, scheme: str, bits: Optional[int]):
     """Extract watermark payload from image."""
-    if scheme == "lsb":
+    if scheme == "auto":
+        try:
+            scheme, raw = wm_detect.extract_auto(image, validate=is_payload)
+        except wm_detect.NoWatermarkError as e:
+            click.echo(f"[!] {e}")
+            return
+        click.echo(f"Detected scheme: {scheme}", err=True)
+    elif scheme == "lsb":
         raw = wm_lsb.extract(image)
+    elif bits is None:
+        raw = wm_dct.extract_bytes(image)
     else:
         bit_arr = wm_dct.extract(image, bits)
         raw = np.packbits(bit_arr).tobytes()
@@ -85,5 +146,38 @@ def extract(image: Path, scheme: str, bits: int):
         import sys
         sys.stdout.buffer.write(raw)
 
+@cli.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--out", type=click.Path(file_okay=False, path_type=Path), required=True)
+@click.option("--scheme", type=click.Choice(["lsb", "dct"]), default="lsb")
+@click.option("--signer", type=str, required=True)
+@click.option("--algo", type=click.Choice(["rsa", "ecc"]), default="rsa")
+@click.option("--priv", type=click.Path(path_type=Path), default=Path("private.pem"))
+@click.option("--extra", type=str, default="{}", help="JSON string of extra metadata")
+@click.option("--bits-per-block", type=click.IntRange(1, len(wm_dct.PAIRS)), default=1,
+              help="For DCT embedding: coefficient pairs (bits) used per block")
+@click.option("--workers", type=click.IntRange(min=1), default=2, show_default=True)
+@click.option("--queue-size", type=click.IntRange(min=1), default=16, show_default=True, help="Bounded queue length (backpressure)")
+@click.option("--interval", type=float, default=1.0, show_default=True, help="Poll interval in seconds")
+@click.option("--stats-interval", type=float, default=10.0, show_default=True, help="Seconds between stats lines")
+def watch(directory: Path, out: Path, scheme: str, signer: str, algo: str, priv: Path, extra: str,
+          bits_per_block: int, workers: int, queue_size: int, interval: float, stats_interval: float):
+    """Watch a folder: embed + sign new PNGs into --out until interrupted."""
+    watcher = Watcher(
+        directory, out, priv.read_bytes(),
+        scheme=scheme, signer=signer, algo=algo, extra=json.loads(extra),
+        bits_per_block=bits_per_block, workers=workers, queue_size=queue_size, interval=interval,
+    ).start()
+    click.echo(f"Watching {directory} → {out} ({workers} workers, queue {queue_size}). Ctrl-C to stop.")
+    try:
+        while True:
+            time.sleep(stats_interval)
+            click.echo(json.dumps(watcher.stats()))
+    except KeyboardInterrupt:
+        click.echo("Stopping; finishing queued files ...")
+    finally:
+        watcher.stop()
+        click.echo(json.dumps(watcher.stats()))
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,238 @@
+from __future__ import annotations
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, Optional, Tuple
+
+from cryptography.hazmat.primitives import serialization
+
+from .keys import gen_rsa_3072, gen_ecc_p256
+
+# -------------------------------
+# Pre-generated keypair pool
+# -------------------------------
+
+_GENERATORS = {"rsa": gen_rsa_3072, "ecc": gen_ecc_p256}
+STALE_AFTER = 3600.0  # seconds before an orphaned .tmp / .claimed file is treated as abandoned
+RETRY_BACKOFF = (0.5, 60.0)  # first / max delay in seconds after consecutive generate/persist failures
+
+def _write_secure(path: Path, data: bytes) -> None:
+    """Write atomically with owner-only permissions (tmp file + rename)."""
+    tmp = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+class KeyPool:
+    """
+    Keeps up to `depth` keypairs of one scheme ready. Keys are generated by
+    background worker threads, handed out by get() without waiting, and
+    persisted under `directory/<scheme>/` (0700 dir, 0600 files) so the pool
+    survives restarts. With a passphrase, private keys are encrypted at rest.
+    A key that cannot be generated or persisted (e.g. full disk) is counted in
+    `failures` / `last_error` and retried with exponential backoff.
+
+        pool = KeyPool(Path(".keypool"), scheme="rsa", depth=8).start()
+        priv_pem, pub_pem = pool.get()
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        scheme: str = "rsa",
+        depth: int = 8,
+        workers: int = 2,
+        passphrase: Optional[bytes] = None,
+    ):
+        if scheme not in _GENERATORS:
+            raise ValueError("Unknown scheme")
+        if depth < 1:
+            raise ValueError("depth must be >= 1")
+        self.scheme = scheme
+        self.depth = depth
+        self.workers = workers
+        self.directory = Path(directory) / scheme
+        self._passphrase = passphrase
+        self._ready: Deque[Tuple[str, bytes, bytes]] = deque()
+        self._inflight = 0
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._refill: Optional[threading.Thread] = None
+        self._running = False
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0  # keys generated but not persisted (or not generated)
+        self.last_error: Optional[str] = None
+        self._consecutive_failures = 0
+
+    # ---- lifecycle ----
+
+    def start(self) -> "KeyPool":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        os.chmod(self.directory, 0o700)
+        self._load_existing()
+        self._running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="keypool")
+        self._refill = threading.Thread(target=self._refill_loop, name="keypool-refill", daemon=True)
+        self._refill.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._refill:
+            self._refill.join()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "KeyPool":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---- public API ----
+
+    def get(self) -> Tuple[bytes, bytes]:
+        """
+        Return (private_pem, public_pem), unencrypted like gen_rsa_3072/gen_ecc_p256.
+        If the pool is empty the key is generated inline (counted as a miss).
+
+        Each key is claimed on disk (atomic rename) before it is returned; if
+        another process sharing the directory claimed it first, it is skipped,
+        so a key is never handed out twice.
+        """
+        while True:
+            with self._cond:
+                if not self._ready:
+                    self.misses += 1
+                    break
+                key_id, priv, pub = self._ready.popleft()
+                self._cond.notify_all()
+            if self._claim(key_id):
+                with self._cond:
+                    self.hits += 1
+                return priv, pub
+        return _GENERATORS[self.scheme]()
+
+    def size(self) -> int:
+        with self._cond:
+            return len(self._ready)
+
+    def wait_full(self, timeout: Optional[float] = None) -> bool:
+        """Block until the pool holds `depth` keys (mainly for tests / warm-up)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self._ready) >= self.depth, timeout)
+
+    # ---- internals ----
+
+    def _refill_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: not self._running or len(self._ready) + self._inflight < self.depth
+                )
+                if not self._running:
+                    return
+                if self._consecutive_failures:
+                    # back off exponentially instead of regenerating keys in a tight loop
+                    first, cap = RETRY_BACKOFF
+                    delay = min(cap, first * 2 ** (self._consecutive_failures - 1))
+                    if self._cond.wait_for(lambda: not self._running, timeout=delay):
+                        return
+                self._inflight += 1
+            fut = self._executor.submit(_GENERATORS[self.scheme])
+            fut.add_done_callback(self._on_generated)
+
+    def _on_generated(self, fut: Future) -> None:
+        key_id = uuid.uuid4().hex
+        try:
+            priv, pub = fut.result()
+            self._persist(key_id, priv, pub)
+        except Exception as e:
+            for path in self._paths(key_id):  # no half-persisted pair left behind
+                path.unlink(missing_ok=True)
+            with self._cond:
+                self._inflight -= 1
+                self.failures += 1
+                self._consecutive_failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                self._cond.notify_all()
+            return
+        with self._cond:
+            self._inflight -= 1
+            self._consecutive_failures = 0
+            self._ready.append((key_id, priv, pub))
+            self._cond.notify_all()
+
+    def _paths(self, key_id: str) -> Tuple[Path, Path]:
+        return self.directory / f"{key_id}.priv.pem", self.directory / f"{key_id}.pub.pem"
+
+    def _persist(self, key_id: str, priv: bytes, pub: bytes) -> None:
+        priv_path, pub_path = self._paths(key_id)
+        if self._passphrase:
+            key = serialization.load_pem_private_key(priv, password=None)
+            stored = key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.BestAvailableEncryption(self._passphrase),
+            )
+        else:
+            stored = priv
+        # public half first: a private file on disk always has its pair
+        _write_secure(pub_path, pub)
+        _write_secure(priv_path, stored)
+
+    def _claim(self, key_id: str) -> bool:
+        """Atomically take ownership of a pooled key; False if someone else has it."""
+        priv_path, pub_path = self._paths(key_id)
+        claimed = self.directory / f"{key_id}.claimed.{uuid.uuid4().hex}"
+        try:
+            os.rename(priv_path, claimed)
+        except FileNotFoundError:
+            return False
+        claimed.unlink(missing_ok=True)
+        pub_path.unlink(missing_ok=True)
+        return True
+
+    def _remove_stale(self) -> None:
+        """
+        Delete .tmp / .claimed files left by a process that died mid-write or
+        mid-claim. Only files older than STALE_AFTER go: a live process sharing
+        the directory may be using younger ones right now.
+        """
+        cutoff = time.time() - STALE_AFTER
+        for pattern in ("*.tmp", "*.claimed.*"):
+            for p in self.directory.glob(pattern):
+                try:
+                    if p.stat().st_mtime < cutoff:
+                        p.unlink(missing_ok=True)
+                except FileNotFoundError:
+                    continue
+
+    def _load_existing(self) -> None:
+        self._remove_stale()
+        for priv_path in sorted(self.directory.glob("*.priv.pem")):
+            key_id = priv_path.name[: -len(".priv.pem")]
+            pub_path = self._paths(key_id)[1]
+            if not pub_path.exists():
+                continue
+            try:
+                key = serialization.load_pem_private_key(priv_path.read_bytes(), password=self._passphrase)
+            except (ValueError, TypeError):
+                continue  # wrong / missing passphrase: leave the file alone
+            priv = key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+            self._ready.append((key_id, priv, pub_path.read_bytes()))
@@ -0,0 +1,201 @@
+from __future__ import annotations
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from .signature import Algo, sign_bytes, verify_bytes
+
+# -------------------------------
+# Merkle tree over fixed-size file chunks
+#   leaf = SHA256(0x00 || chunk), node = SHA256(0x01 || left || right)
+#   an odd node at the end of a level is promoted unchanged.
+# -------------------------------
+
+CHUNK_SIZE = 1 << 20
+SIDECAR_VERSION = 1
+_MAGIC = b"SCA-MERKLE-v1"
+
+Proof = List[Tuple[bytes, bool]]  # (sibling hash, sibling_is_left)
+
+def leaf_hash(chunk: bytes) -> bytes:
+    h = hashlib.sha256(b"\x00")
+    h.update(chunk)
+    return h.digest()
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def _num_chunks(size: int, chunk_size: int) -> int:
+    return max(1, -(-size // chunk_size))
+
+def _read_chunk(path: Path, index: int, size: int, chunk_size: int) -> bytes:
+    """Read chunk `index`, never past the signed file size."""
+    with path.open("rb") as f:
+        f.seek(index * chunk_size)
+        return f.read(max(0, min(chunk_size, size - index * chunk_size)))
+
+def chunk_hashes(path: Path, chunk_size: int = CHUNK_SIZE) -> List[bytes]:
+    """Leaf hashes of every chunk, streaming the file once."""
+    with path.open("rb") as f:
+        leaves = [leaf_hash(c) for c in iter(lambda: f.read(chunk_size), b"")]
+    return leaves or [leaf_hash(b"")]
+
+def _parent_level(level: Sequence[bytes]) -> List[bytes]:
+    nxt = [_node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        nxt.append(level[-1])
+    return nxt
+
+def tree_levels(leaves: Sequence[bytes]) -> List[List[bytes]]:
+    """All tree levels, leaves first and [root] last (n - 1 node hashes in total)."""
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        levels.append(_parent_level(levels[-1]))
+    return levels
+
+def merkle_root(leaves: Sequence[bytes]) -> bytes:
+    return tree_levels(leaves)[-1][0]
+
+def merkle_proof(leaves: Sequence[bytes], index: int, levels: Optional[List[List[bytes]]] = None) -> Proof:
+    """Proof for leaf `index`; pass precomputed `levels` to avoid rebuilding the tree."""
+    proof: Proof = []
+    for level in (levels or tree_levels(leaves))[:-1]:
+        sib = index ^ 1
+        if sib < len(level):
+            proof.append((level[sib], sib < index))
+        index //= 2
+    return proof
+
+def verify_proof(leaf: bytes, proof: Proof, root: bytes) -> bool:
+    h = leaf
+    for sib, sib_is_left in proof:
+        h = _node_hash(sib, h) if sib_is_left else _node_hash(h, sib)
+    return h == root
+
+def verify_span(levels: List[List[bytes]], lo: int, span: Sequence[bytes], root: bytes) -> bool:
+    """
+    Check the contiguous leaves span = leaves[lo : lo + len(span)] against root
+    in one bottom-up pass. Only the span's own hashes plus the sibling hash at
+    each edge of each level are taken from `levels`.
+    """
+    span = list(span)
+    for level in levels[:-1]:
+        if lo % 2:
+            span.insert(0, level[lo - 1])
+            lo -= 1
+        end = lo + len(span)
+        if end % 2 and end < len(level):
+            span.append(level[end])
+        span, lo = _parent_level(span), lo // 2
+    return span == [root]
+
+# -------------------------------
+# Chunked signing / sidecar
+# -------------------------------
+
+def _signed_message(root: bytes, size: int, chunk_size: int) -> bytes:
+    return _MAGIC + size.to_bytes(8, "big") + chunk_size.to_bytes(8, "big") + root
+
+def sign_file_chunked(
+    path: Path, private_pem: bytes, algo: Algo = "rsa", chunk_size: int = CHUNK_SIZE
+) -> Tuple[bytes, dict]:
+    """
+    Hash the file in chunk_size chunks, sign the Merkle root (bound to file size
+    and chunk size). Returns (detached signature, sidecar dict with chunk hashes).
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    leaves = chunk_hashes(path, chunk_size)
+    root = merkle_root(leaves)
+    size = path.stat().st_size
+    sig = sign_bytes(_signed_message(root, size, chunk_size), private_pem, algo=algo)
+    sidecar = {
+        "version": SIDECAR_VERSION,
+        "algo": algo,
+        "chunk_size": chunk_size,
+        "size": size,
+        "root": root.hex(),
+        "leaves": [h.hex() for h in leaves],
+    }
+    return sig, sidecar
+
+def save_sidecar(sidecar: dict, path: Path) -> None:
+    path.write_text(json.dumps(sidecar, separators=(",", ":")))
+
+def load_sidecar(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+def verify_sidecar(sidecar: dict, signature: bytes, public_pem: bytes) -> bool:
+    """Check the signature over the sidecar's root/size/chunk_size (no file access)."""
+    if sidecar.get("version") != SIDECAR_VERSION:
+        return False
+    size, chunk_size = int(sidecar["size"]), int(sidecar["chunk_size"])
+    if chunk_size < 1 or size < 0:
+        return False
+    if len(sidecar["leaves"]) != _num_chunks(size, chunk_size):
+        return False
+    msg = _signed_message(bytes.fromhex(sidecar["root"]), size, chunk_size)
+    return verify_bytes(msg, signature, public_pem, algo=sidecar["algo"])
+
+def verify_range(
+    path: Path,
+    start: int,
+    end: int,
+    signature: bytes,
+    sidecar: dict,
+    public_pem: bytes,
+) -> bool:
+    """
+    Verify bytes [start, end) of path: one signature check over the root, then
+    read only the chunks covering the range and check them against the root in
+    one bottom-up pass (range leaves + edge sibling hashes per level).
+    """
+    size, chunk_size = int(sidecar["size"]), int(sidecar["chunk_size"])
+    if not (0 <= start < end <= size):
+        raise ValueError(f"Range [{start}, {end}) outside file of {size} bytes")
+    if not verify_sidecar(sidecar, signature, public_pem):
+        return False
+
+    root = bytes.fromhex(sidecar["root"])
+    levels = tree_levels([bytes.fromhex(h) for h in sidecar["leaves"]])
+    lo, hi = start // chunk_size, (end - 1) // chunk_size
+    with path.open("rb") as f:
+        f.seek(lo * chunk_size)
+        span = [
+            leaf_hash(f.read(max(0, min(chunk_size, size - i * chunk_size))))
+            for i in range(lo, hi + 1)
+        ]
+    return verify_span(levels, lo, span, root)
+
+def find_corrupt_chunks(
+    path: Path,
+    signature: bytes,
+    sidecar: dict,
+    public_pem: bytes,
+    workers: Optional[int] = None,
+) -> List[int]:
+    """
+    Return indices of chunks whose hash differs from the signed sidecar.
+    Chunks are hashed in a thread pool (hashlib releases the GIL on large buffers).
+    Bytes appended past the signed size are reported as index len(leaves).
+    Raises ValueError if the sidecar itself does not match the signature.
+    """
+    if not verify_sidecar(sidecar, signature, public_pem):
+        raise ValueError("Sidecar does not match signature")
+    if merkle_root([bytes.fromhex(h) for h in sidecar["leaves"]]).hex() != sidecar["root"]:
+        raise ValueError("Sidecar chunk hashes do not match signed root")
+
+    chunk_size, size = int(sidecar["chunk_size"]), int(sidecar["size"])
+    expected = sidecar["leaves"]
+
+    def check(i: int) -> bool:
+        return leaf_hash(_read_chunk(path, i, size, chunk_size)).hex() == expected[i]
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        ok = list(ex.map(check, range(len(expected))))
+    bad = [i for i, good in enumerate(ok) if not good]
+    if path.stat().st_size > size:
+        bad.append(len(expected))  # trailing bytes past the signed size
+    return bad
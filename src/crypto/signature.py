@@ -6,12 +6,22 @@ from cryptography.hazmat.primitives.asymmetric import padding, ec
 
 Algo = Literal["rsa", "ecc"]
 
+def _private_key(private_pem):
+    if isinstance(private_pem, (bytes, bytearray)):
+        return serialization.load_pem_private_key(bytes(private_pem), password=None)
+    return private_pem
+
+def _public_key(public_pem):
+    if isinstance(public_pem, (bytes, bytearray)):
+        return serialization.load_pem_public_key(bytes(public_pem))
+    return public_pem
+
 def sign_bytes(data: bytes, private_pem: bytes, algo: Algo = "rsa") -> bytes:
     """
     Sign bytes using either RSA (PSS+SHA256) or ECDSA P-256 (SHA256).
-    private_pem: raw PEM bytes of private key
+    private_pem: raw PEM bytes of private key (or an already loaded key object)
     """
-    key = serialization.load_pem_private_key(private_pem, password=None)
+    key = _private_key(private_pem)
     if algo == "rsa":
         return key.sign(
             data,
@@ -23,7 +33,8 @@ def sign_bytes(data: bytes, private_pem: bytes, algo: Algo = "rsa") -> bytes:
     raise ValueError("Unknown algo")
 
 def verify_bytes(data: bytes, signature: bytes, public_pem: bytes, algo: Algo = "rsa") -> bool:
-    pub = serialization.load_pem_public_key(public_pem)
+    """public_pem: raw PEM bytes of public key (or an already loaded key object)"""
+    pub = _public_key(public_pem)
     try:
         if algo == "rsa":
             pub.verify(
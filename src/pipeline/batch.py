@@ -0,0 +1,89 @@
+# src/pipeline/batch.py
+from __future__ import annotations
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+from cryptography.hazmat.primitives import serialization
+
+from ..crypto.signature import verify_file
+from .bind import is_payload, parse_payload
+from ..watermark import lsb as wm_lsb
+from ..watermark import dct as wm_dct
+from ..watermark import detect as wm_detect
+
+# Per-process state of pool workers, filled once by _init_worker so each task
+# does not re-read / re-parse the signature and public key. Only set inside
+# pool workers; the in-process path passes them to _check explicitly.
+_SIG: Optional[bytes] = None
+_PUB = None
+_ALGO = "rsa"
+
+def _init_worker(sig: Optional[bytes], public_pem: Optional[bytes], algo: str) -> None:
+    global _SIG, _PUB, _ALGO
+    _SIG = sig
+    _PUB = serialization.load_pem_public_key(public_pem) if public_pem else None
+    _ALGO = algo
+
+def _check(idx: int, path: Path, scheme: str, bits: Optional[int], sig: Optional[bytes], pub, algo: str) -> dict:
+    res = {"idx": idx, "file": Path(path).name, "scheme": scheme, "verify": None, "meta": None, "error": None}
+
+    t0 = time.perf_counter()
+    if sig is not None and pub is not None:
+        res["verify"] = verify_file(Path(path), sig, pub, algo=algo)
+    t1 = time.perf_counter()
+    try:
+        if scheme == "auto":
+            res["scheme"], raw = wm_detect.extract_auto(Path(path), validate=is_payload)
+        elif scheme == "lsb":
+            raw = wm_lsb.extract(Path(path))
+        elif bits is None:
+            raw = wm_dct.extract_bytes(Path(path))
+        else:
+            raw = np.packbits(wm_dct.extract(Path(path), bits)).tobytes()
+        res["meta"] = parse_payload(raw)
+    except Exception as e:
+        res["error"] = str(e)
+    t2 = time.perf_counter()
+
+    res["verify_ms"] = (t1 - t0) * 1000
+    res["extract_ms"] = (t2 - t1) * 1000
+    return res
+
+def check_image(idx: int, path: Path, scheme: str, bits: Optional[int] = None) -> dict:
+    """
+    Pool task: verify the worker's loaded signature against one image and extract its watermark.
+    scheme: "lsb" | "dct" | "auto"; bits: raw DCT bit count (None -> length-prefixed).
+    """
+    return _check(idx, path, scheme, bits, _SIG, _PUB, _ALGO)
+
+def check_images(
+    paths: Sequence[Path],
+    sig: Optional[bytes],
+    public_pem: Optional[bytes],
+    algo: str = "rsa",
+    scheme: str = "lsb",
+    bits: Optional[int] = None,
+    workers: int = 0,
+) -> Iterator[dict]:
+    """
+    Fan check_image out over a process pool and yield results as they complete
+    (not in input order; use result["idx"]). workers=0 -> os.cpu_count(), 1 -> in-process.
+    """
+    if workers == 1 or len(paths) <= 1:
+        # in-process: keep the key local, module globals are shared by every caller thread
+        pub = serialization.load_pem_public_key(public_pem) if public_pem else None
+        for i, p in enumerate(paths):
+            yield _check(i, p, scheme, bits, sig, pub, algo)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers or None,
+        initializer=_init_worker,
+        initargs=(sig, public_pem, algo),
+    ) as ex:
+        futs = [ex.submit(check_image, i, p, scheme, bits) for i, p in enumerate(paths)]
+        for fut in as_completed(futs):
+            yield fut.result()
@@ -18,3 +18,11 @@ def build_payload(file_path: Path, signer: str, algo: str, extra: Optional[dict]
 
 def parse_payload(b: bytes) -> dict:
     return json.loads(b.decode("utf-8"))
+
+def is_payload(b: bytes) -> bool:
+    """True if b parses as a payload (extract_auto validator against probe false positives)."""
+    try:
+        parse_payload(b)
+        return True
+    except Exception:
+        return False
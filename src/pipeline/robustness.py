@@ -0,0 +1,229 @@
+# src/pipeline/robustness.py
+from __future__ import annotations
+import io
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import product
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageEnhance
+
+from .bind import build_payload
+from ..watermark import dct as wm_dct
+
+# -------------------------------
+# Attack matrix
+# -------------------------------
+
+@dataclass(frozen=True)
+class Attack:
+    kind: str  # "none" | "jpeg" | "crop" | "brightness"
+    param: float = 0.0
+
+    @property
+    def label(self) -> str:
+        if self.kind == "none":
+            return "none"
+        if self.kind == "jpeg":
+            return f"jpeg_q{int(self.param)}"
+        if self.kind == "crop":
+            return f"crop_{int(self.param)}px"
+        return f"brightness_x{self.param:g}"
+
+def build_attacks(
+    jpeg_qualities: Iterable[int] = (),
+    crops: Iterable[int] = (),
+    brightness: Iterable[float] = (),
+) -> List[Attack]:
+    """Expand attack parameter lists into one Attack per setting (plus a clean baseline)."""
+    attacks = [Attack("none")]
+    attacks += [Attack("jpeg", q) for q in jpeg_qualities]
+    attacks += [Attack("crop", c) for c in crops]
+    attacks += [Attack("brightness", b) for b in brightness]
+    return attacks
+
+def apply_attack(img: Image.Image, attack: Attack) -> Image.Image:
+    img = img.convert("RGB")
+    if attack.kind == "none":
+        return img
+    if attack.kind == "jpeg":
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=int(attack.param))
+        buf.seek(0)
+        return Image.open(buf).convert("RGB")
+    if attack.kind == "crop":
+        c = int(attack.param)
+        w, h = img.size
+        return img.crop((c, c, w - c, h - c))
+    if attack.kind == "brightness":
+        return ImageEnhance.Brightness(img).enhance(attack.param)
+    raise ValueError(f"Unknown attack: {attack.kind}")
+
+# -------------------------------
+# Jobs (one per image x ALPHA x BLOCK x bits_per_block)
+# -------------------------------
+
+@dataclass(frozen=True)
+class Job:
+    image: Path
+    alpha: float
+    block: int
+    attacks: Tuple[Attack, ...]
+    payload: Optional[bytes] = None  # default: build_payload(image, ...)
+    bits_per_block: int = 1
+
+@dataclass
+class AttackResult:
+    attack: str
+    ber: float
+    attack_s: float
+    extract_s: float
+
+@dataclass
+class JobResult:
+    image: str
+    alpha: float
+    block: int
+    pixels: int
+    payload_bits: int
+    bits_per_block: int = 1
+    embed_s: float = 0.0
+    attacks: List[AttackResult] = field(default_factory=list)
+    error: Optional[str] = None
+
+def bit_error_rate(expected: np.ndarray, got: np.ndarray) -> float:
+    n = expected.size
+    if n == 0:
+        return 0.0
+    got = got[:n]
+    errors = int(np.count_nonzero(expected[: got.size] != got)) + (n - got.size)
+    return errors / n
+
+def run_job(job: Job) -> JobResult:
+    """
+    Embed once, then attack + extract for every attack in the job.
+    The job's alpha/block are passed to the DCT scheme explicitly; its
+    module constants are left untouched.
+    """
+    payload = job.payload or build_payload(job.image, "robustness", "rsa")
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    with Image.open(job.image) as im:
+        w, h = im.size
+    res = JobResult(str(job.image), job.alpha, job.block, w * h, int(bits.size), job.bits_per_block)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        wm_path = tmp / "wm.png"
+        t0 = time.perf_counter()
+        try:
+            wm_dct.embed(job.image, bits, wm_path, bits_per_block=job.bits_per_block,
+                         alpha=job.alpha, block=job.block)
+        except wm_dct.DCTWatermarkError as e:
+            res.error = str(e)
+            return res
+        res.embed_s = time.perf_counter() - t0
+
+        wm_img = Image.open(wm_path).convert("RGB")
+        for attack in job.attacks:
+            t0 = time.perf_counter()
+            attacked = apply_attack(wm_img, attack)
+            att_path = tmp / f"{attack.label}.png"
+            attacked.save(att_path, "PNG")
+            t1 = time.perf_counter()
+            got = wm_dct.extract(att_path, int(bits.size), job.bits_per_block, block=job.block)
+            t2 = time.perf_counter()
+            res.attacks.append(AttackResult(attack.label, bit_error_rate(bits, got), t1 - t0, t2 - t1))
+    return res
+
+def build_jobs(
+    images: Sequence[Path],
+    alphas: Sequence[float],
+    blocks: Sequence[int],
+    attacks: Sequence[Attack],
+    payload: Optional[bytes] = None,
+    bits_per_block: Sequence[int] = (1,),
+) -> List[Job]:
+    return [
+        Job(Path(img), float(a), int(b), tuple(attacks), payload, int(k))
+        for img, a, b, k in product(images, alphas, blocks, bits_per_block)
+    ]
+
+def run_matrix(jobs: Sequence[Job], workers: int = 0) -> Tuple[List[JobResult], float]:
+    """
+    Run jobs across a process pool (workers=0 -> os.cpu_count(), workers=1 -> in-process).
+    Returns (results in job order, wall-clock seconds).
+    """
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [run_job(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or None) as ex:
+            results = list(ex.map(run_job, jobs))
+    return results, time.perf_counter() - t0
+
+# -------------------------------
+# Reporting
+# -------------------------------
+
+def summarize(results: Sequence[JobResult]) -> List[dict]:
+    """Mean/max BER grouped by (alpha, block, bits_per_block, attack)."""
+    groups: dict = {}
+    for r in results:
+        for a in r.attacks:
+            groups.setdefault((r.alpha, r.block, r.bits_per_block, a.attack), []).append(a.ber)
+    return [
+        {
+            "alpha": alpha,
+            "block": block,
+            "bits_per_block": bpb,
+            "attack": attack,
+            "n": len(bers),
+            "mean_ber": float(np.mean(bers)),
+            "max_ber": float(np.max(bers)),
+        }
+        for (alpha, block, bpb, attack), bers in sorted(groups.items())
+    ]
+
+def throughput(results: Sequence[JobResult], wall_s: float) -> dict:
+    """Per-stage throughput (ops/s and megapixels/s of summed worker time) plus wall-clock rate."""
+    stages = {"embed": [0, 0.0, 0], "attack": [0, 0.0, 0], "extract": [0, 0.0, 0]}
+    for r in results:
+        if r.error:
+            continue
+        stages["embed"][0] += 1
+        stages["embed"][1] += r.embed_s
+        stages["embed"][2] += r.pixels
+        for a in r.attacks:
+            for name, secs in (("attack", a.attack_s), ("extract", a.extract_s)):
+                stages[name][0] += 1
+                stages[name][1] += secs
+                stages[name][2] += r.pixels
+    out = {}
+    for name, (ops, secs, px) in stages.items():
+        out[name] = {
+            "ops": ops,
+            "seconds": secs,
+            "ops_per_s": ops / secs if secs else 0.0,
+            "mpix_per_s": px / 1e6 / secs if secs else 0.0,
+        }
+    out["wall"] = {"jobs": len(results), "seconds": wall_s, "jobs_per_s": len(results) / wall_s if wall_s else 0.0}
+    return out
+
+def format_report(summary: Sequence[dict], tput: dict) -> str:
+    lines = [f"{'alpha':>6} {'block':>5} {'bpb':>3} {'attack':<18} {'n':>4} {'mean_ber':>9} {'max_ber':>8}"]
+    for s in summary:
+        lines.append(
+            f"{s['alpha']:>6g} {s['block']:>5d} {s['bits_per_block']:>3d} {s['attack']:<18} {s['n']:>4d} {s['mean_ber']:>9.4f} {s['max_ber']:>8.4f}"
+        )
+    lines.append("")
+    lines.append(f"{'stage':<8} {'ops':>6} {'sec':>9} {'ops/s':>9} {'MPix/s':>9}")
+    for name in ("embed", "attack", "extract"):
+        t = tput[name]
+        lines.append(f"{name:<8} {t['ops']:>6d} {t['seconds']:>9.3f} {t['ops_per_s']:>9.2f} {t['mpix_per_s']:>9.2f}")
+    w = tput["wall"]
+    lines.append(f"wall: {w['jobs']} jobs in {w['seconds']:.2f}s ({w['jobs_per_s']:.2f} jobs/s)")
+    return "\n".join(lines)
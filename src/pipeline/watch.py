@@ -0,0 +1,294 @@
+# src/pipeline/watch.py
+from __future__ import annotations
+import os
+import queue
+import signal
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Deque, Dict, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from cryptography.hazmat.primitives import serialization
+
+from ..crypto.signature import sign_file
+from .bind import build_payload
+from ..watermark import lsb as wm_lsb
+from ..watermark import dct as wm_dct
+
+# Per-process state, filled once by _init_worker so the private key is
+# parsed once per worker instead of once per file.
+_PRIV = None
+
+def _init_worker(private_pem: bytes) -> None:
+    global _PRIV
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C is handled by the parent (graceful stop)
+    _PRIV = serialization.load_pem_private_key(private_pem, password=None)
+
+def output_paths(src: Path, out_dir: Path) -> Tuple[Path, Path]:
+    return out_dir / f"{src.stem}_wm.png", out_dir / f"{src.stem}_wm.sig"
+
+def process_file(
+    src: Path,
+    out_dir: Path,
+    scheme: str,
+    signer: str,
+    algo: str,
+    extra: Optional[dict] = None,
+    bits_per_block: int = 1,
+) -> Tuple[Path, Path]:
+    """
+    Embed + sign one image. Both outputs are written to temp names unique to
+    this call and renamed into place (image first, then .sig), so a present
+    .sig means a complete pair.
+    """
+    out_png, out_sig = output_paths(src, out_dir)
+    tag = f"{os.getpid()}.{uuid.uuid4().hex}"
+    tmp_png = out_dir / f".{out_png.name}.{tag}.tmp"
+    tmp_sig = out_dir / f".{out_sig.name}.{tag}.tmp"
+    try:
+        payload = build_payload(src, signer, algo, extra)
+        if scheme == "lsb":
+            wm_lsb.embed(src, payload, tmp_png)
+        else:
+            wm_dct.embed_bytes(src, payload, tmp_png, bits_per_block=bits_per_block)
+        tmp_sig.write_bytes(sign_file(tmp_png, _PRIV, algo=algo))
+        os.replace(tmp_png, out_png)
+        os.replace(tmp_sig, out_sig)
+    finally:
+        tmp_png.unlink(missing_ok=True)
+        tmp_sig.unlink(missing_ok=True)
+    return out_png, out_sig
+
+class Watcher:
+    """
+    Poll `directory` for new/changed images and embed + sign them into `out_dir`.
+
+    - A stat index (mtime_ns, size) detects changes; a file is queued only
+      once its stat is unchanged across two polls (i.e. it is fully written).
+    - Files go through a bounded queue: when it is full the poller blocks,
+      which is the backpressure on scanning.
+    - `workers` dispatcher threads each feed one task at a time to a process
+      pool whose workers load the private key once.
+    - Files whose .sig output is newer than the input are skipped, so a
+      restart does not reprocess finished work.
+    - A file is never processed twice at once: if it changes while in
+      flight, it is queued again only after the running task finishes.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        out_dir: Path,
+        private_pem: bytes,
+        scheme: str = "lsb",
+        signer: str = "watch",
+        algo: str = "rsa",
+        extra: Optional[dict] = None,
+        bits_per_block: int = 1,
+        workers: int = 2,
+        queue_size: int = 16,
+        interval: float = 1.0,
+        patterns: Sequence[str] = ("*.png",),
+    ):
+        self.directory = Path(directory)
+        self.out_dir = Path(out_dir)
+        if self.out_dir.resolve() == self.directory.resolve():
+            raise ValueError("Output directory must differ from the watched directory")
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if queue_size < 1:
+            raise ValueError("queue_size must be >= 1 (0 would make the queue unbounded)")
+        self.private_pem = private_pem
+        self.scheme = scheme
+        self.signer = signer
+        self.algo = algo
+        self.extra = extra
+        self.bits_per_block = bits_per_block
+        self.workers = workers
+        self.interval = interval
+        self.patterns = tuple(patterns)
+
+        self.queue: "queue.Queue[Optional[Tuple[Path, float]]]" = queue.Queue(maxsize=queue_size)
+        self._index: Dict[Path, Tuple[int, int]] = {}   # last seen stat
+        self._done: Dict[Path, Tuple[int, int]] = {}    # stat at enqueue time
+        self._inflight: Set[Path] = set()                # queued or being processed
+        self._stop = threading.Event()
+        self._threads = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self._service: Deque[float] = deque(maxlen=1000)
+        self._started = 0.0
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.errors: Deque[Tuple[str, str]] = deque(maxlen=50)
+
+    # ---- lifecycle ----
+
+    def start(self) -> "Watcher":
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._started = time.monotonic()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.private_pem,)
+        )
+        self._threads = [threading.Thread(target=self._dispatch, name=f"watch-worker-{i}", daemon=True)
+                         for i in range(self.workers)]
+        self._threads.append(threading.Thread(target=self._poll_loop, name="watch-poller", daemon=True))
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop polling, let queued files finish, shut the pool down."""
+        self._stop.set()
+        if not self._threads:
+            return
+        poller, dispatchers = self._threads[-1], self._threads[:-1]
+        poller.join()
+        for _ in dispatchers:
+            self.queue.put(None)
+        for t in dispatchers:
+            t.join()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "Watcher":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---- polling ----
+
+    def poll_once(self) -> int:
+        """Scan the directory once; queue files whose stat is stable. Returns files queued."""
+        queued = 0
+        seen = set()
+        for pattern in self.patterns:
+            for p in sorted(self.directory.glob(pattern)):
+                try:
+                    st = p.stat()
+                except FileNotFoundError:
+                    continue
+                key = (st.st_mtime_ns, st.st_size)
+                seen.add(p)
+                prev = self._index.get(p)
+                self._index[p] = key
+                if prev != key or self._done.get(p) == key:
+                    continue  # new/still changing, or already handled
+                with self._lock:
+                    if p in self._inflight:
+                        continue  # picked up again once the running task is done
+                first = p not in self._done
+                self._done[p] = key
+                if first and self._up_to_date(p, st.st_mtime_ns):
+                    continue  # finished before a restart (later changes always reprocess)
+                if not self._put((p, time.monotonic())):
+                    return queued
+                queued += 1
+        for p in set(self._index) - seen:  # deleted files
+            self._index.pop(p, None)
+            self._done.pop(p, None)
+        return queued
+
+    def _up_to_date(self, src: Path, mtime_ns: int) -> bool:
+        sig = output_paths(src, self.out_dir)[1]
+        try:
+            return sig.stat().st_mtime_ns >= mtime_ns
+        except FileNotFoundError:
+            return False
+
+    def _put(self, item) -> bool:
+        """Blocking put (backpressure) that still honours stop()."""
+        with self._lock:
+            self._inflight.add(item[0])
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.2)
+                with self._lock:
+                    self.enqueued += 1
+                return True
+            except queue.Full:
+                continue
+        with self._lock:
+            self._inflight.discard(item[0])
+        return False
+
+    def _poll_loop(self) -> None:
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.interval)
+
+    # ---- workers ----
+
+    def _dispatch(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            src, t_enq = item
+            t0 = time.monotonic()
+            try:
+                self._executor.submit(
+                    process_file, src, self.out_dir, self.scheme, self.signer,
+                    self.algo, self.extra, self.bits_per_block,
+                ).result()
+                ok = True
+            except Exception as e:
+                ok = False
+                with self._lock:
+                    self.errors.append((src.name, str(e)))
+            t1 = time.monotonic()
+            with self._lock:
+                self._inflight.discard(src)
+                if ok:
+                    self.processed += 1
+                else:
+                    self.failed += 1
+                self._latencies.append(t1 - t_enq)
+                self._service.append(t1 - t0)
+            self.queue.task_done()
+
+    def drain(self) -> None:
+        """Block until everything queued so far has been processed."""
+        self.queue.join()
+
+    # ---- stats ----
+
+    def stats(self) -> dict:
+        """
+        Queue depth, counters and latency (enqueue -> done) / service-time
+        percentiles in ms. arrival_rate x service_mean_s ~= workers needed.
+        """
+        with self._lock:
+            lat = np.array(self._latencies) * 1000 if self._latencies else np.zeros(1)
+            svc = np.array(self._service) * 1000 if self._service else np.zeros(1)
+            enqueued, processed, failed = self.enqueued, self.processed, self.failed
+            last_error = self.errors[-1] if self.errors else None
+        uptime = max(time.monotonic() - self._started, 1e-9) if self._started else 0.0
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_max": self.queue.maxsize,
+            "workers": self.workers,
+            "enqueued": enqueued,
+            "processed": processed,
+            "failed": failed,
+            "arrival_rate": enqueued / uptime if uptime else 0.0,
+            "throughput": (processed + failed) / uptime if uptime else 0.0,
+            "latency_ms": {
+                "p50": float(np.percentile(lat, 50)),
+                "p95": float(np.percentile(lat, 95)),
+                "max": float(lat.max()),
+            },
+            "service_ms": {
+                "mean": float(svc.mean()),
+                "p95": float(np.percentile(svc, 95)),
+            },
+            "last_error": last_error,
+        }
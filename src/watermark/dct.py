@@ -1,5 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
+from typing import Optional
 import numpy as np
 from PIL import Image
 from scipy.fftpack import dct, idct
@@ -9,6 +10,19 @@ class DCTWatermarkError(Exception):
 
 BLOCK = 8
 ALPHA = 8.0  # tweak for quality vs robustness
+HEADER_BITS = 32  # embed_bytes header: payload length (low 24 bits) + bits_per_block (high byte), LE
+
+# Mid-frequency coefficient pairs, one payload bit each; bits_per_block=k uses the first k.
+PAIRS = (
+    ((2, 3), (3, 2)),
+    ((1, 4), (4, 1)),
+    ((2, 4), (4, 2)),
+    ((1, 3), (3, 1)),
+    ((3, 4), (4, 3)),
+    ((0, 4), (4, 0)),
+    ((1, 5), (5, 1)),
+    ((2, 5), (5, 2)),
+)
 
 def _to_gray(img: Image.Image) -> np.ndarray:
     return np.array(img.convert("L"), dtype=np.float32)
@@ -26,68 +40,190 @@ def _bits_to_bytes(bits: np.ndarray) -> bytes:
         bits = np.concatenate([bits, np.zeros(pad, dtype=np.uint8)])
     return np.packbits(bits).tobytes()
 
-def embed(image_path: Path, payload_bits: np.ndarray, output_path: Path) -> None:
+def _params(alpha, block):
+    """alpha/block arguments, defaulting to the module constants."""
+    return (ALPHA if alpha is None else alpha), (BLOCK if block is None else block)
+
+def _block_origin(i: int, per_row: int, block: int):
+    return (i // per_row) * block, (i % per_row) * block
+
+def _pairs(bits_per_block: int, block: int):
+    if not 1 <= bits_per_block <= len(PAIRS):
+        raise DCTWatermarkError(f"bits_per_block must be 1..{len(PAIRS)}")
+    pairs = PAIRS[:bits_per_block]
+    if max(max(c1 + c2) for c1, c2 in pairs) >= block:
+        raise DCTWatermarkError(f"bits_per_block={bits_per_block} needs BLOCK > {block}")
+    return pairs
+
+def _embed_bits(
+    Y: np.ndarray, Yw: np.ndarray, bits: np.ndarray, bits_per_block: int = 1, start_block: int = 0,
+    alpha: Optional[float] = None, block: Optional[int] = None,
+) -> None:
+    """Write bits into Yw, bits_per_block coefficient pairs per block from start_block on."""
+    alpha, block = _params(alpha, block)
+    pairs = _pairs(bits_per_block, block)
+    per_row = Y.shape[1] // block
+    n_blocks = -(-bits.size // bits_per_block)
+    for i in range(n_blocks):
+        by, bx = _block_origin(start_block + i, per_row, block)
+        tile = Y[by:by+block, bx:bx+block]
+        B = dct(dct(tile.T, norm='ortho').T, norm='ortho')
+        # One bit per pair of mid-frequency coefficients
+        for j, (c1, c2) in enumerate(pairs):
+            k = i * bits_per_block + j
+            if k >= bits.size:
+                break
+            if bits[k] == 1:
+                if B[c1] <= B[c2]:
+                    B[c1] += alpha
+            else:
+                if B[c1] >= B[c2]:
+                    B[c2] += alpha
+        Yw[by:by+block, bx:bx+block] = idct(idct(B.T, norm='ortho').T, norm='ortho')
+
+def _crop_to_blocks(Y: np.ndarray, block: Optional[int] = None) -> np.ndarray:
+    block = BLOCK if block is None else block
+    h, w = Y.shape
+    return Y[: h - (h % block), : w - (w % block)]
+
+def embed(
+    image_path: Path, payload_bits: np.ndarray, output_path: Path, bits_per_block: int = 1,
+    alpha: Optional[float] = None, block: Optional[int] = None,
+) -> None:
     """
     Embed bits by modifying mid-frequency DCT coefficients.
-    One bit per 8x8 block (therefore capacity ~ (h/8)*(w/8) ).
-    payload_bits: numpy array of 0/1
+    bits_per_block coefficient pairs (see PAIRS) per block x block tile, so capacity is
+    ~ (h/block)*(w/block)*bits_per_block and only ceil(bits/bits_per_block) blocks are touched.
+    payload_bits: numpy array of 0/1; alpha/block default to ALPHA/BLOCK.
     """
+    alpha, block = _params(alpha, block)
+    _pairs(bits_per_block, block)  # reject bad bits_per_block before it is used
     img = Image.open(image_path)
-    Y = _to_gray(img)
+    Y = _crop_to_blocks(_to_gray(img), block)
     h, w = Y.shape
-    if h % BLOCK or w % BLOCK:
-        Y = Y[: h - (h % BLOCK), : w - (w % BLOCK)]
-        h, w = Y.shape
 
-    num_blocks = (h // BLOCK) * (w // BLOCK)
-    if payload_bits.size > num_blocks:
-        raise DCTWatermarkError("Payload too large for DCT scheme (one bit per block).")
+    num_blocks = (h // block) * (w // block)
+    if payload_bits.size > num_blocks * bits_per_block:
+        raise DCTWatermarkError(f"Payload too large for DCT scheme ({bits_per_block} bit(s) per block).")
 
-    k = 0
     Yw = Y.copy()
-    for by in range(0, h, BLOCK):
-        for bx in range(0, w, BLOCK):
-            block = Y[by:by+BLOCK, bx:bx+BLOCK]
-            B = dct(dct(block.T, norm='ortho').T, norm='ortho')
-            # Use a pair of mid-frequency coefficients
-            c1, c2 = (2, 3), (3, 2)
-            bit = payload_bits[k] if k < payload_bits.size else 0
-            if bit == 1:
-                if B[c1] < B[c2]:
-                    B[c1] += ALPHA
-            else:
-                if B[c1] > B[c2]:
-                    B[c2] += ALPHA
-            block_w = idct(idct(B.T, norm='ortho').T, norm='ortho')
-            Yw[by:by+BLOCK, bx:bx+BLOCK] = block_w
-            k += 1
-            if k >= payload_bits.size:
-                break
-        if k >= payload_bits.size:
-            break
-
+    _embed_bits(Y, Yw, payload_bits, bits_per_block, alpha=alpha, block=block)
     _from_gray(Yw).save(output_path, format="PNG")
 
-def extract(image_path: Path, num_bits: int) -> np.ndarray:
+def _extract_bits(
+    Y: np.ndarray, num_bits: int, bits_per_block: int = 1, start_block: int = 0, block: Optional[int] = None,
+) -> np.ndarray:
+    block = BLOCK if block is None else block
+    pairs = _pairs(bits_per_block, block)
+    Y = _crop_to_blocks(Y, block)
+    per_row = Y.shape[1] // block
+    n_avail = max(0, (Y.shape[0] // block) * per_row - start_block)
+
+    bits = np.zeros(num_bits, dtype=np.uint8)
+    for i in range(min(n_avail, -(-num_bits // bits_per_block))):
+        by, bx = _block_origin(start_block + i, per_row, block)
+        tile = Y[by:by+block, bx:bx+block]
+        B = dct(dct(tile.T, norm='ortho').T, norm='ortho')
+        for j, (c1, c2) in enumerate(pairs):
+            k = i * bits_per_block + j
+            if k >= num_bits:
+                break
+            bits[k] = 1 if B[c1] > B[c2] else 0
+    return bits
+
+def extract(image_path: Path, num_bits: int, bits_per_block: int = 1, block: Optional[int] = None) -> np.ndarray:
     """
-    Extract num_bits bits from DCT embedding.
+    Extract num_bits bits from DCT embedding (block defaults to BLOCK).
     Returns numpy array of 0/1 bits length num_bits.
     """
     img = Image.open(image_path)
-    Y = _to_gray(img)
-    h, w = Y.shape
-    h -= h % BLOCK
-    w -= w % BLOCK
+    return _extract_bits(_to_gray(img), num_bits, bits_per_block, block=block)
 
-    bits = np.zeros(num_bits, dtype=np.uint8)
-    k = 0
-    for by in range(0, h, BLOCK):
-        for bx in range(0, w, BLOCK):
-            block = Y[by:by+BLOCK, bx:bx+BLOCK]
-            B = dct(dct(block.T, norm='ortho').T, norm='ortho')
-            c1, c2 = (2, 3), (3, 2)
-            bits[k] = 1 if B[c1] > B[c2] else 0
-            k += 1
-            if k >= num_bits:
-                return bits
-    return bits
+# -------------------------------
+# Length-prefixed payloads (same 4-byte header as the LSB scheme)
+# -------------------------------
+
+def capacity_blocks(size) -> int:
+    w, h = size
+    return (h // BLOCK) * (w // BLOCK)
+
+def embed_bytes(image_path: Path, payload: bytes, output_path: Path, bits_per_block: int = 1) -> None:
+    """
+    Embed a 4-byte little-endian header (length | bits_per_block << 24) at one
+    bit per block in the first HEADER_BITS blocks, then the payload at
+    bits_per_block bits per block.
+    """
+    _pairs(bits_per_block, BLOCK)  # reject bad bits_per_block before it is used
+    if len(payload) >= 1 << 24:
+        raise DCTWatermarkError("Payload too large for DCT header.")
+    img = Image.open(image_path)
+    Y = _crop_to_blocks(_to_gray(img))
+    bits = _bytes_to_bits(payload)
+    if HEADER_BITS + -(-bits.size // bits_per_block) > capacity_blocks((Y.shape[1], Y.shape[0])):
+        raise DCTWatermarkError(f"Payload too large for DCT scheme ({bits_per_block} bit(s) per block).")
+
+    header = (len(payload) | (bits_per_block << 24)).to_bytes(4, "little")
+    Yw = Y.copy()
+    _embed_bits(Y, Yw, _bytes_to_bits(header))
+    _embed_bits(Y, Yw, bits, bits_per_block, start_block=HEADER_BITS)
+    _from_gray(Yw).save(output_path, format="PNG")
+
+def _load_rgb(image_path: Path) -> np.ndarray:
+    return np.asarray(Image.open(image_path).convert("RGB"))
+
+def _gray_rows(rgb: np.ndarray, rows: int) -> np.ndarray:
+    """Gray (same conversion as _to_gray) of only the top `rows` block rows."""
+    return _to_gray(Image.fromarray(np.ascontiguousarray(rgb[: rows * BLOCK]), "RGB"))
+
+def _block_rows(n_blocks: int, per_row: int) -> int:
+    return -(-n_blocks // per_row)
+
+def probe_header_rgb(rgb: np.ndarray):
+    """
+    Transform only the header blocks (first HEADER_BITS blocks, i.e. the top
+    block rows) of a decoded HxWx3 array. Returns (payload length in bytes,
+    bits_per_block) if it fits the image capacity, else None.
+    """
+    h, w = rgb.shape[:2]
+    per_row = w // BLOCK
+    if per_row == 0:
+        return None
+    rows = _block_rows(HEADER_BITS, per_row)
+    if rows * BLOCK > h:
+        return None
+    Y = _gray_rows(rgb, rows)
+    hdr = int.from_bytes(_bits_to_bytes(_extract_bits(Y, HEADER_BITS)), "little")
+    n, bits_per_block = hdr & 0xFFFFFF, (hdr >> 24) or 1
+    if n == 0 or bits_per_block > len(PAIRS):
+        return None
+    if HEADER_BITS + -(-n * 8 // bits_per_block) > capacity_blocks((w, h)):
+        return None
+    return n, bits_per_block
+
+def probe_header(image_path: Path):
+    """probe_header_rgb for an image file."""
+    return probe_header_rgb(_load_rgb(image_path))
+
+def probe_length(image_path: Path):
+    """Payload length in bytes from the header blocks, or None (see probe_header)."""
+    hdr = probe_header(image_path)
+    return hdr[0] if hdr else None
+
+def extract_bytes_rgb(rgb: np.ndarray, hdr=None) -> bytes:
+    """
+    Extract an embed_bytes payload from a decoded HxWx3 array, converting only
+    the block rows that hold header + payload. hdr from probe_header_rgb (read if None).
+    """
+    hdr = hdr or probe_header_rgb(rgb)
+    if hdr is None:
+        raise DCTWatermarkError("No valid DCT length header.")
+    n, bits_per_block = hdr
+    n_bits = n * 8
+    per_row = rgb.shape[1] // BLOCK
+    Y = _gray_rows(rgb, _block_rows(HEADER_BITS + -(-n_bits // bits_per_block), per_row))
+    bits = _extract_bits(Y, n_bits, bits_per_block, start_block=HEADER_BITS)
+    return _bits_to_bytes(bits)[:n]
+
+def extract_bytes(image_path: Path) -> bytes:
+    """Extract a payload written by embed_bytes."""
+    return extract_bytes_rgb(_load_rgb(image_path))
@@ -0,0 +1,68 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from . import lsb as wm_lsb
+from . import dct as wm_dct
+
+class NoWatermarkError(Exception):
+    pass
+
+class InvalidPayloadError(NoWatermarkError):
+    """A header probe matched, but no payload could be extracted or passed validation."""
+
+# Cheapest probe first: LSB header is 32 pixels, DCT header is 32 blocks.
+# (name, PNG only, probe on decoded RGB array, full extractor on the same array)
+_CASCADE = (
+    ("lsb", True, wm_lsb.probe_header_rgb, wm_lsb.extract_rgb),
+    ("dct", False, wm_dct.probe_header_rgb, wm_dct.extract_bytes_rgb),
+)
+
+def _load_rgb(image_path: Path) -> np.ndarray:
+    return np.asarray(Image.open(image_path).convert("RGB"))
+
+def _matches(image_path: Path, rgb: np.ndarray):
+    """Yield (name, header, extractor) for every scheme whose header probe matches."""
+    is_png = image_path.suffix.lower() == ".png"
+    for name, png_only, probe, full in _CASCADE:
+        if png_only and not is_png:
+            continue
+        hdr = probe(rgb)
+        if hdr is not None:
+            yield name, hdr, full
+
+def detect(image_path: Path) -> Optional[Tuple[str, int]]:
+    """Return (scheme, payload length) of the first header probe that matches, else None."""
+    image_path = Path(image_path)
+    for name, hdr, _ in _matches(image_path, _load_rgb(image_path)):
+        return name, hdr[0]
+    return None
+
+def extract_auto(
+    image_path: Path, validate: Optional[Callable[[bytes], bool]] = None
+) -> Tuple[str, bytes]:
+    """
+    Decode the image once, try schemes cheapest-first on that array and run
+    the full extractor only for a scheme whose header probe matched. If
+    validate is given, a payload it rejects (a probe false positive) falls
+    through to the next scheme. Raises InvalidPayloadError if a header
+    matched but no payload was accepted, NoWatermarkError if none matched.
+    """
+    image_path = Path(image_path)
+    rgb = _load_rgb(image_path)
+    rejected = []
+    for name, hdr, full in _matches(image_path, rgb):
+        try:
+            raw = full(rgb, hdr)
+        except (wm_lsb.WatermarkError, wm_dct.DCTWatermarkError) as e:
+            rejected.append(f"{name}: {e}")
+            continue
+        if validate is None or validate(raw):
+            return name, raw
+        rejected.append(f"{name}: payload failed validation")
+    if rejected:
+        raise InvalidPayloadError("Watermark header found but payload invalid (" + "; ".join(rejected) + ").")
+    raise NoWatermarkError("No LSB or DCT watermark header found.")
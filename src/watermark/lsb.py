@@ -6,7 +6,17 @@ from PIL import Image
 class WatermarkError(Exception):
     pass
 
-HEADER_BITS = 32  # payload length (bytes), little-endian
+HEADER_BITS = 32  # payload length (low 24 bits) + layout (high byte), little-endian
+
+# Layout: which RGB channels carry payload and how many low bits of each.
+# The header always sits in the blue LSB of the first HEADER_BITS pixels; the
+# payload starts at pixel HEADER_BITS. Layout byte 0 means blue/1 bit, which is
+# also what headers written before layouts existed decode to.
+_CHANNEL_SLICES = {
+    "R": slice(0, 1), "G": slice(1, 2), "B": slice(2, 3),
+    "RG": slice(0, 2), "GB": slice(1, 3), "RB": slice(0, 3, 2), "RGB": slice(0, 3),
+}
+_CHANNEL_MASK = {"R": 1, "G": 2, "B": 4}
 
 def _ensure_png(path: Path):
     if path.suffix.lower() != ".png":
@@ -27,39 +37,146 @@ def _i32le(n: int) -> bytes:
 def _u32le(b: bytes) -> int:
     return int.from_bytes(b, "little")
 
-def embed(image_path: Path, payload: bytes, output_path: Path) -> None:
+def _normalize_channels(channels: str) -> str:
+    chans = "".join(c for c in "RGB" if c in channels.upper())
+    if not chans or len(chans) != len(set(channels.upper())) or chans not in _CHANNEL_SLICES:
+        raise WatermarkError(f"Invalid LSB channels: {channels!r} (use a subset of 'RGB').")
+    return chans
+
+def _layout_byte(channels: str, bits: int) -> int:
+    if (channels, bits) == ("B", 1):
+        return 0
+    mask = sum(_CHANNEL_MASK[c] for c in channels)
+    return mask | ((bits - 1) << 3)
+
+def _parse_layout(byte: int):
+    if byte == 0:
+        return "B", 1
+    mask, bits = byte & 0b111, ((byte >> 3) & 1) + 1
+    if not mask or byte >> 4:
+        return None
+    return "".join(c for c in "RGB" if mask & _CHANNEL_MASK[c]), bits
+
+def capacity(size, channels: str = "B", bits: int = 1) -> int:
+    """Payload capacity in bytes of an image of `size` for the given layout."""
+    w, h = size
+    return max(0, (w * h - HEADER_BITS) * len(_normalize_channels(channels)) * bits // 8)
+
+def _to_symbols(payload: bytes, bits: int) -> np.ndarray:
+    """Split bytes into `bits`-wide symbols, MSB first (8/bits symbols per byte)."""
+    data = np.frombuffer(payload, dtype=np.uint8)
+    if bits == 1:
+        return np.unpackbits(data)
+    shifts = np.arange(8 - bits, -1, -bits, dtype=np.uint8)
+    return ((data[:, None] >> shifts) & ((1 << bits) - 1)).reshape(-1)
+
+def _from_symbols(sym: np.ndarray, bits: int) -> bytes:
+    if bits == 1:
+        return np.packbits(sym).tobytes()
+    shifts = np.arange(8 - bits, -1, -bits, dtype=np.uint8)
+    return np.bitwise_or.reduce(sym.reshape(-1, 8 // bits) << shifts, axis=1).astype(np.uint8).tobytes()
+
+def _payload_view(pix: np.ndarray, channels: str, n_slots: int) -> np.ndarray:
+    """Strided view (no copy) of the pixels/channels holding n_slots symbols."""
+    c = len(channels)
+    n_pix = -(-n_slots // c)
+    return pix[HEADER_BITS : HEADER_BITS + n_pix, _CHANNEL_SLICES[channels]]
+
+def embed(image_path: Path, payload: bytes, output_path: Path, channels: str = "B", bits: int = 1) -> None:
     """
-    Embed payload (bytes) into LSB of blue channel of PNG image.
-    Header: 4 bytes (little-endian) length of payload in bytes.
+    Embed payload (bytes) into the low `bits` bits (1-2) of `channels` of a PNG image.
+    Header: 4 bytes (little-endian) in the blue LSB of the first 32 pixels:
+    payload length in bytes, with the layout in the high byte.
     """
     _ensure_png(image_path)
+    channels = _normalize_channels(channels)
+    if bits not in (1, 2):
+        raise WatermarkError("LSB bits per channel must be 1 or 2.")
+    if len(payload) >= 1 << 24:
+        raise WatermarkError("Payload too large for LSB header.")
+
     img = Image.open(image_path).convert("RGB")
     arr = np.array(img)
-    blue = arr[:, :, 2].copy()
+    pix = arr.reshape(-1, 3)  # view onto arr
 
-    header = _i32le(len(payload))
-    bits = _bytes_to_bits(header + payload)
-
-    if bits.size > blue.size:
+    if pix.shape[0] < HEADER_BITS or len(payload) > capacity(img.size, channels, bits):
         raise WatermarkError("Insufficient capacity; larger image or smaller payload needed.")
 
-    flat = blue.flatten()
-    flat[: bits.size] = (flat[: bits.size] & ~1) | bits
-    arr[:, :, 2] = flat.reshape(blue.shape)
+    header = _i32le(len(payload) | (_layout_byte(channels, bits) << 24))
+    hdr = pix[:HEADER_BITS, 2]
+    hdr &= 0xFE
+    hdr |= _bytes_to_bits(header)
+
+    sym = _to_symbols(payload, bits)
+    c = len(channels)
+    pad = (-sym.size) % c
+    view = _payload_view(pix, channels, sym.size)
+    if pad:
+        # keep the existing low bits of the unused tail slots of the last pixel
+        tail = view[-1].copy() & ((1 << bits) - 1)
+        sym = np.concatenate([sym, tail[c - pad:]])
+    keep = np.uint8(0xFF ^ ((1 << bits) - 1))
+    view &= keep
+    view |= sym.reshape(-1, c)
 
     Image.fromarray(arr, "RGB").save(output_path, format="PNG")
 
+def _read_header(pix: np.ndarray):
+    hdr = _u32le(_bits_to_bytes(pix[:HEADER_BITS, 2] & 1))
+    layout = _parse_layout(hdr >> 24)
+    if layout is None:
+        return None
+    return hdr & 0xFFFFFF, layout[0], layout[1]
+
+def _load_rgb(image_path: Path) -> np.ndarray:
+    return np.asarray(Image.open(image_path).convert("RGB"))
+
+def extract_rgb(rgb: np.ndarray, hdr=None) -> bytes:
+    """Extract from an already decoded HxWx3 array; hdr from probe_header_rgb (read if None)."""
+    pix = rgb.reshape(-1, 3)
+    if pix.shape[0] < HEADER_BITS:
+        raise WatermarkError("Image too small for LSB header.")
+
+    hdr = hdr or _read_header(pix)
+    if hdr is None:
+        raise WatermarkError("Invalid LSB header layout.")
+    n, channels, bits = hdr
+    n_slots = n * 8 // bits
+    view = _payload_view(pix, channels, n_slots)
+    sym = (view & ((1 << bits) - 1)).reshape(-1)[:n_slots]
+    if sym.size < n_slots:
+        raise WatermarkError("Truncated watermark payload.")
+    return _from_symbols(sym, bits)
+
 def extract(image_path: Path) -> bytes:
+    """Extract a payload; channels/bits are taken from the header."""
     _ensure_png(image_path)
-    img = Image.open(image_path).convert("RGB")
-    arr = np.array(img)
-    flat = arr[:, :, 2].flatten()
+    return extract_rgb(_load_rgb(image_path))
 
-    hdr_bits = flat[:HEADER_BITS] & 1
-    hdr = _bits_to_bytes(hdr_bits)
-    n = _u32le(hdr)
+def probe_header_rgb(rgb: np.ndarray):
+    """
+    Read only the HEADER_BITS header pixels of a decoded HxWx3 array. Returns
+    (payload length in bytes, channels, bits) if the layout is valid and the
+    length fits its capacity, else None.
+    """
+    h, w = rgb.shape[:2]
+    if w * h < HEADER_BITS:
+        return None
+    hdr = _read_header(rgb.reshape(-1, 3)[:HEADER_BITS])
+    if hdr is None:
+        return None
+    n, channels, bits = hdr
+    if n == 0 or n > capacity((w, h), channels, bits):
+        return None
+    return hdr
 
-    data_bits = flat[HEADER_BITS : HEADER_BITS + n * 8] & 1
-    if data_bits.size < n * 8:
-        raise WatermarkError("Truncated watermark payload.")
-    return _bits_to_bytes(data_bits)[:n]
+def probe_header(image_path: Path):
+    """probe_header_rgb for a PNG file (None for other formats)."""
+    if image_path.suffix.lower() != ".png":
+        return None
+    return probe_header_rgb(_load_rgb(image_path))
+
+def probe_length(image_path: Path):
+    """Payload length in bytes from the header pixels, or None (see probe_header)."""
+    hdr = probe_header(image_path)
+    return hdr[0] if hdr else None
@@ -0,0 +1,54 @@
+from pathlib import Path
+import sys
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.crypto.keys import gen_ecc_p256
+from src.crypto.signature import sign_file
+from src.pipeline.batch import check_images
+from src.pipeline.bind import build_payload
+from src.watermark import dct as wm_dct
+
+def make_png(path: Path):
+    Image.new("RGB", (256, 256), (230, 240, 250)).save(path, "PNG")
+
+def test_check_images_parallel(tmp_path: Path):
+    img = tmp_path / "in.png"; make_png(img)
+    payload = build_payload(img, "Tester", "ecc")
+    out_wm = tmp_path / "out_wm.png"
+    wm_dct.embed(img, np.unpackbits(np.frombuffer(payload, dtype=np.uint8)), out_wm)
+
+    priv, pub = gen_ecc_p256()
+    sig = sign_file(out_wm, priv, algo="ecc")
+
+    tampered = tmp_path / "tampered.png"
+    im = Image.open(out_wm).convert("RGB"); im.putpixel((255, 255), (0, 0, 0)); im.save(tampered, "PNG")
+
+    paths = [out_wm, tampered, img]
+    results = sorted(
+        check_images(paths, sig, pub, algo="ecc", scheme="dct", bits=len(payload) * 8, workers=2),
+        key=lambda r: r["idx"],
+    )
+    assert [r["verify"] for r in results] == [True, False, False]
+    assert results[0]["meta"]["signer"] == "Tester"
+    assert results[1]["meta"]["signer"] == "Tester"
+    assert results[2]["meta"] is None and results[2]["error"]
+    assert all(r["verify_ms"] >= 0 and r["extract_ms"] >= 0 for r in results)
+
+def test_check_images_without_key(tmp_path: Path):
+    img = tmp_path / "in.png"; make_png(img)
+    (res,) = list(check_images([img], None, None, scheme="dct", workers=1))
+    assert res["verify"] is None
+
+def test_in_process_check_leaves_no_module_state(tmp_path: Path):
+    from src.pipeline import batch
+    img = tmp_path / "in.png"; make_png(img)
+    priv, pub = gen_ecc_p256()
+    sig = sign_file(img, priv, algo="ecc")
+    (res,) = list(check_images([img], sig, pub, algo="ecc", scheme="dct", workers=1))
+    assert res["verify"] is True
+    assert (batch._SIG, batch._PUB) == (None, None)
@@ -1,6 +1,7 @@
 from pathlib import Path
 import sys
 import numpy as np
+import pytest
 from PIL import Image
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -22,3 +23,52 @@ def test_dct_embed_extract_roundtrip(tmp_path: Path):
     bits_out = wm_dct.extract(outp, len(bits))
     raw = np.packbits(bits_out).tobytes()[: len(payload)]
     assert raw == payload
+
+def _ber_after_jpeg(path: Path, tmp_path: Path, bits: np.ndarray, k: int, quality: int) -> float:
+    jpg = tmp_path / f"q{quality}_k{k}.jpg"
+    Image.open(path).save(jpg, "JPEG", quality=quality)
+    back = tmp_path / f"q{quality}_k{k}.png"
+    Image.open(jpg).save(back, "PNG")
+    return float(np.mean(wm_dct.extract(back, bits.size, k) != bits))
+
+def test_dct_multi_bit_capacity_and_robustness(tmp_path: Path):
+    src = tmp_path / "in.png"
+    Image.new("RGB", (64, 64), (200, 200, 200)).save(src, "PNG")  # 64 blocks
+    bits = np.random.default_rng(0).integers(0, 2, 200).astype(np.uint8)
+
+    # capacity: 200 bits do not fit at one bit per block, but do at 4
+    with pytest.raises(wm_dct.DCTWatermarkError):
+        wm_dct.embed(src, bits, tmp_path / "x.png")
+
+    bers = {}
+    for k in (4, 6, 8):
+        outp = tmp_path / f"k{k}.png"
+        wm_dct.embed(src, bits, outp, bits_per_block=k)
+        assert np.array_equal(wm_dct.extract(outp, bits.size, k), bits)
+
+        # only ceil(200 / k) blocks are touched
+        touched = -(-bits.size // k)
+        Y = np.array(Image.open(outp).convert("L"))
+        by, bx = divmod(touched, 8)
+        assert (Y[by * 8:(by + 1) * 8, bx * 8:(bx + 1) * 8] == 200).all()
+
+        assert _ber_after_jpeg(outp, tmp_path, bits, k, 90) == 0.0
+        bers[k] = _ber_after_jpeg(outp, tmp_path, bits, k, 75)
+    # more pairs per block -> more (and higher-frequency) coefficients to lose
+    assert bers[4] <= bers[8]
+
+def test_dct_bytes_header_records_bits_per_block(tmp_path: Path):
+    src = tmp_path / "in.png"; make_png(src)
+    payload = b'{"signer":"Tester"}'
+    outp = tmp_path / "out.png"
+    wm_dct.embed_bytes(src, payload, outp, bits_per_block=4)
+    assert wm_dct.probe_header(outp) == (len(payload), 4)
+    assert wm_dct.extract_bytes(outp) == payload
+
+@pytest.mark.parametrize("bpb", [0, -1, len(wm_dct.PAIRS) + 1])
+def test_dct_rejects_bad_bits_per_block_up_front(tmp_path: Path, bpb: int):
+    src = tmp_path / "in.png"; make_png(src)
+    with pytest.raises(wm_dct.DCTWatermarkError, match="bits_per_block must be"):
+        wm_dct.embed_bytes(src, b"x", tmp_path / "a.png", bits_per_block=bpb)
+    with pytest.raises(wm_dct.DCTWatermarkError, match="bits_per_block must be"):
+        wm_dct.embed(src, np.ones(8, dtype=np.uint8), tmp_path / "b.png", bits_per_block=bpb)
@@ -0,0 +1,62 @@
+from pathlib import Path
+import sys
+import numpy as np
+import pytest
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.watermark import lsb as wm_lsb
+from src.watermark import dct as wm_dct
+from src.watermark import detect as wm_detect
+
+def make_png(path: Path, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    arr = rng.integers(0, 256, size=(128, 192, 3), dtype=np.uint8)
+    Image.fromarray(arr, "RGB").save(path, "PNG")
+
+PAYLOAD = b'{"signer":"Tester","algo":"rsa"}'
+
+def test_auto_detects_lsb(tmp_path: Path):
+    src = tmp_path / "in.png"; make_png(src)
+    out = tmp_path / "lsb.png"
+    wm_lsb.embed(src, PAYLOAD, out)
+    assert wm_detect.detect(out) == ("lsb", len(PAYLOAD))
+    assert wm_detect.extract_auto(out) == ("lsb", PAYLOAD)
+
+def test_auto_detects_length_prefixed_dct(tmp_path: Path):
+    src = tmp_path / "in.png"
+    Image.new("RGB", (192, 128), (240, 240, 240)).save(src, "PNG")
+    out = tmp_path / "dct.png"
+    wm_dct.embed_bytes(src, PAYLOAD, out)
+    assert wm_dct.extract_bytes(out) == PAYLOAD
+    assert wm_lsb.probe_length(out) is None
+    assert wm_detect.extract_auto(out) == ("dct", PAYLOAD)
+
+def test_unmarked_image_rejected_by_probes(tmp_path: Path):
+    src = tmp_path / "in.png"; make_png(src, seed=1)
+    assert wm_detect.detect(src) is None
+    with pytest.raises(wm_detect.NoWatermarkError):
+        wm_detect.extract_auto(src)
+
+def test_extract_auto_decodes_once(tmp_path: Path, monkeypatch):
+    src = tmp_path / "in.png"
+    Image.new("RGB", (192, 128), (240, 240, 240)).save(src, "PNG")
+    out = tmp_path / "dct.png"
+    wm_dct.embed_bytes(src, PAYLOAD, out)
+
+    opened = []
+    real_open = Image.open
+    monkeypatch.setattr(Image, "open", lambda *a, **k: opened.append(a[0]) or real_open(*a, **k))
+    # LSB probe misses, DCT probe + full extraction reuse the same array
+    assert wm_detect.extract_auto(out, validate=lambda raw: raw == PAYLOAD) == ("dct", PAYLOAD)
+    assert len(opened) == 1
+
+def test_matched_header_with_rejected_payload_is_reported_as_invalid(tmp_path: Path):
+    src = tmp_path / "in.png"; make_png(src)
+    out = tmp_path / "lsb.png"
+    wm_lsb.embed(src, b"not a payload", out)
+    with pytest.raises(wm_detect.InvalidPayloadError, match="lsb: payload failed validation"):
+        wm_detect.extract_auto(out, validate=lambda raw: False)
@@ -0,0 +1,71 @@
+from pathlib import Path
+import sys
+import os
+import stat
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.crypto.keypool import STALE_AFTER, KeyPool
+from src.crypto.signature import sign_bytes, verify_bytes
+
+def test_pool_fills_hands_out_and_refills(tmp_path: Path):
+    with KeyPool(tmp_path, scheme="ecc", depth=3) as pool:
+        assert pool.wait_full(timeout=30)
+        priv, pub = pool.get()
+        assert verify_bytes(b"x", sign_bytes(b"x", priv, algo="ecc"), pub, algo="ecc")
+        assert pool.hits == 1 and pool.misses == 0
+        assert pool.wait_full(timeout=30)
+
+    files = list((tmp_path / "ecc").glob("*.priv.pem"))
+    assert len(files) == 3
+    assert all(stat.S_IMODE(f.stat().st_mode) == 0o600 for f in files)
+    assert stat.S_IMODE((tmp_path / "ecc").stat().st_mode) == 0o700
+
+def test_pool_persists_encrypted_across_restarts(tmp_path: Path):
+    with KeyPool(tmp_path, scheme="ecc", depth=2, passphrase=b"s3cret") as pool:
+        assert pool.wait_full(timeout=30)
+    on_disk = sorted((tmp_path / "ecc").glob("*.priv.pem"))
+    assert b"ENCRYPTED" in on_disk[0].read_bytes()
+
+    with KeyPool(tmp_path, scheme="ecc", depth=2, passphrase=b"s3cret") as pool:
+        assert pool.size() == 2  # loaded from disk at start, nothing regenerated
+        priv, pub = pool.get()
+        assert b"ENCRYPTED" not in priv
+        assert (tmp_path / "ecc" / on_disk[0].name).exists() != (tmp_path / "ecc" / on_disk[1].name).exists()
+
+def test_two_pools_sharing_a_directory_never_issue_the_same_key(tmp_path: Path):
+    with KeyPool(tmp_path, scheme="ecc", depth=4) as pool:
+        assert pool.wait_full(timeout=30)
+
+    a = KeyPool(tmp_path, scheme="ecc", depth=4).start()
+    b = KeyPool(tmp_path, scheme="ecc", depth=4).start()
+    try:
+        assert a.size() >= 4 and b.size() >= 4  # both loaded the same files
+        issued = [a.get()[0] for _ in range(4)] + [b.get()[0] for _ in range(4)]
+    finally:
+        a.stop()
+        b.stop()
+    assert len(set(issued)) == len(issued)
+
+def test_start_keeps_fresh_temp_files_of_other_processes(tmp_path: Path):
+    d = tmp_path / "ecc"; d.mkdir()
+    fresh = d / "abc.priv.pem.tmp"; fresh.write_bytes(b"being written")
+    old = d / "def.claimed.123"; old.write_bytes(b"orphan")
+    os.utime(old, (time.time() - STALE_AFTER - 1,) * 2)
+    pool = KeyPool(tmp_path, scheme="ecc", depth=1).start()
+    pool.stop()
+    assert fresh.exists() and not old.exists()
+
+def test_persist_failures_are_reported_and_backed_off(tmp_path: Path, monkeypatch):
+    def disk_full(*a):
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(KeyPool, "_persist", disk_full)
+    with KeyPool(tmp_path, scheme="ecc", depth=2) as pool:
+        time.sleep(1.0)
+        failures, last_error, size = pool.failures, pool.last_error, pool.size()
+    assert size == 0 and 1 <= failures <= 5  # not a tight regenerate loop
+    assert "No space left" in last_error
+    assert not list((tmp_path / "ecc").glob("*.pem"))
@@ -1,5 +1,7 @@
 from pathlib import Path
 import sys
+import numpy as np
+import pytest
 from PIL import Image
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -18,3 +20,44 @@ def test_lsb_embed_extract_roundtrip(tmp_path: Path):
     wm_lsb.embed(src, payload, outp)
     raw = wm_lsb.extract(outp)
     assert raw == payload
+
+def make_noise_png(path: Path, size=(64, 48)):
+    rng = np.random.default_rng(0)
+    arr = rng.integers(0, 256, size=(size[1], size[0], 3), dtype=np.uint8)
+    Image.fromarray(arr, "RGB").save(path, "PNG")
+
+@pytest.mark.parametrize("channels,bits", [("B", 1), ("R", 2), ("RB", 1), ("GB", 2), ("RGB", 1), ("RGB", 2)])
+def test_lsb_layouts_roundtrip(tmp_path: Path, channels: str, bits: int):
+    src = tmp_path / "in.png"; make_noise_png(src)
+    payload = np.random.default_rng(1).bytes(wm_lsb.capacity((64, 48), channels, bits))
+    outp = tmp_path / "out.png"
+    wm_lsb.embed(src, payload, outp, channels=channels, bits=bits)
+    assert wm_lsb.probe_header(outp) == (len(payload), channels, bits)
+    assert wm_lsb.extract(outp) == payload
+
+    # only the low `bits` bits of the chosen channels change
+    before = np.array(Image.open(src)).astype(int)
+    after = np.array(Image.open(outp)).astype(int)
+    diff = np.abs(after - before).reshape(-1, 3)
+    assert diff.max() < (1 << bits)
+    for i, c in enumerate("RGB"):
+        if c not in channels:
+            assert diff[wm_lsb.HEADER_BITS:, i].max() == 0  # header pixels always use blue
+
+def test_lsb_capacity_grows_6x(tmp_path: Path):
+    src = tmp_path / "in.png"; make_noise_png(src)
+    base = wm_lsb.capacity((64, 48))
+    assert wm_lsb.capacity((64, 48), "RGB", 2) == 6 * base
+    big = b"x" * (base + 1)
+    with pytest.raises(wm_lsb.WatermarkError):
+        wm_lsb.embed(src, big, tmp_path / "a.png")
+    wm_lsb.embed(src, big, tmp_path / "b.png", channels="RGB", bits=2)
+    assert wm_lsb.extract(tmp_path / "b.png") == big
+
+def test_lsb_default_layout_keeps_legacy_header(tmp_path: Path):
+    src = tmp_path / "in.png"; make_png(src)
+    outp = tmp_path / "out.png"
+    wm_lsb.embed(src, b"abc", outp)
+    blue = np.array(Image.open(outp))[:, :, 2].reshape(-1)
+    hdr = np.packbits(blue[:32] & 1).tobytes()
+    assert int.from_bytes(hdr, "little") == 3  # plain length, layout byte 0
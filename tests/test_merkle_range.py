@@ -0,0 +1,104 @@
+from pathlib import Path
+import sys
+import os
+import time
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.crypto.keys import gen_ecc_p256
+from src.crypto import merkle
+
+def test_range_verify_and_corrupt_scan(tmp_path: Path):
+    f = tmp_path / "asset.bin"
+    data = bytearray(os.urandom(10 * 1024 + 123))  # 11 chunks of 1 KiB, last one partial
+    f.write_bytes(bytes(data))
+    priv, pub = gen_ecc_p256()
+    sig, side = merkle.sign_file_chunked(f, priv, algo="ecc", chunk_size=1024)
+    assert len(side["leaves"]) == 11
+
+    assert merkle.verify_range(f, 0, len(data), sig, side, pub)
+    assert merkle.find_corrupt_chunks(f, sig, side, pub, workers=4) == []
+
+    # corrupt chunks 3 and 10
+    data[3 * 1024 + 5] ^= 0xFF
+    data[-1] ^= 0xFF
+    f.write_bytes(bytes(data))
+    assert merkle.verify_range(f, 0, 3 * 1024, sig, side, pub)
+    assert merkle.verify_range(f, 4 * 1024, 9 * 1024 + 10, sig, side, pub)
+    assert not merkle.verify_range(f, 3 * 1024 + 100, 3 * 1024 + 200, sig, side, pub)
+    assert not merkle.verify_range(f, 10 * 1024, len(data), sig, side, pub)
+    assert merkle.find_corrupt_chunks(f, sig, side, pub, workers=4) == [3, 10]
+
+def test_tampered_sidecar_rejected(tmp_path: Path):
+    f = tmp_path / "asset.bin"
+    f.write_bytes(os.urandom(5000))
+    priv, pub = gen_ecc_p256()
+    sig, side = merkle.sign_file_chunked(f, priv, algo="ecc", chunk_size=1024)
+
+    # a forged sibling hash breaks the proof of the chunk being checked
+    forged = dict(side, leaves=list(side["leaves"]))
+    forged["leaves"][0] = merkle.leaf_hash(b"evil").hex()
+    assert not merkle.verify_range(f, 1024, 2048, sig, forged, pub)
+
+    forged = dict(side, size=side["size"] - 1)
+    assert not merkle.verify_sidecar(forged, sig, pub)
+
+def test_proofs_for_every_leaf():
+    leaves = [merkle.leaf_hash(bytes([i])) for i in range(7)]
+    root = merkle.merkle_root(leaves)
+    for i, leaf in enumerate(leaves):
+        assert merkle.verify_proof(leaf, merkle.merkle_proof(leaves, i), root)
+    assert not merkle.verify_proof(leaves[0], merkle.merkle_proof(leaves, 1), root)
+
+def test_span_verification_for_every_range():
+    leaves = [merkle.leaf_hash(bytes([i])) for i in range(7)]
+    levels = merkle.tree_levels(leaves)
+    root = levels[-1][0]
+    for lo in range(7):
+        for hi in range(lo + 1, 8):
+            assert merkle.verify_span(levels, lo, leaves[lo:hi], root)
+            bad = list(leaves[lo:hi]); bad[-1] = merkle.leaf_hash(b"evil")
+            assert not merkle.verify_span(levels, lo, bad, root)
+
+def test_large_range_is_linear(tmp_path: Path):
+    f = tmp_path / "asset.bin"
+    f.write_bytes(os.urandom(8192 * 64))  # 8192 leaves
+    priv, pub = gen_ecc_p256()
+    sig, side = merkle.sign_file_chunked(f, priv, algo="ecc", chunk_size=64)
+    t0 = time.perf_counter()
+    assert merkle.verify_range(f, 0, f.stat().st_size, sig, side, pub)
+    assert merkle.verify_range(f, 100 * 64 + 3, 5000 * 64, sig, side, pub)
+    assert time.perf_counter() - t0 < 2.0
+
+def test_chunk_size_must_be_positive(tmp_path: Path):
+    f = tmp_path / "asset.bin"
+    f.write_bytes(b"abc")
+    priv, pub = gen_ecc_p256()
+    for bad in (0, -1):
+        with pytest.raises(ValueError):
+            merkle.sign_file_chunked(f, priv, algo="ecc", chunk_size=bad)
+    sig, side = merkle.sign_file_chunked(f, priv, algo="ecc", chunk_size=1)
+    assert not merkle.verify_sidecar(dict(side, chunk_size=0), sig, pub)
+
+def test_cli_rejects_bad_chunk_size_and_range(tmp_path: Path):
+    from click.testing import CliRunner
+    from src.cli import cli
+    f = tmp_path / "asset.bin"; f.write_bytes(os.urandom(3000))
+    priv, pub = gen_ecc_p256()
+    (tmp_path / "p.pem").write_bytes(priv); (tmp_path / "q.pem").write_bytes(pub)
+    sig, side = tmp_path / "f.sig", tmp_path / "f.json"
+    runner = CliRunner()
+
+    res = runner.invoke(cli, ["sign-chunked", str(f), "--priv", str(tmp_path / "p.pem"), "--algo", "ecc",
+                              "--chunk-size", "0", "--out", str(sig), "--sidecar", str(side)])
+    assert res.exit_code != 0 and not sig.exists()
+
+    res = runner.invoke(cli, ["sign-chunked", str(f), "--priv", str(tmp_path / "p.pem"), "--algo", "ecc",
+                              "--chunk-size", "1024", "--out", str(sig), "--sidecar", str(side)])
+    assert res.exit_code == 0
+    res = runner.invoke(cli, ["verify-range", str(f), "--pub", str(tmp_path / "q.pem"), "--sig", str(sig),
+                              "--sidecar", str(side), "--start", "10", "--end", "99999"])
+    assert res.exit_code == 0 and res.output.startswith("VERIFY: FAIL (")
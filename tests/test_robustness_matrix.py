@@ -0,0 +1,43 @@
+from pathlib import Path
+import sys
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.pipeline.robustness import build_attacks, build_jobs, run_matrix, summarize, throughput
+from src.watermark import dct as wm_dct
+
+def make_png(path: Path, size=(256, 256)):
+    Image.new("RGB", size, (250, 250, 250)).save(path, "PNG")
+
+def test_matrix_runs_in_pool_and_reports(tmp_path: Path):
+    img = tmp_path / "in.png"; make_png(img)
+    attacks = build_attacks(jpeg_qualities=[90], crops=[8], brightness=[1.01])
+    jobs = build_jobs([img], alphas=[8.0, 16.0], blocks=[8], attacks=attacks, payload=b"hello dct payload")
+    results, wall = run_matrix(jobs, workers=2)
+
+    assert len(results) == 2 and all(r.error is None for r in results)
+    assert all(len(r.attacks) == len(attacks) for r in results)
+    clean = [s for s in summarize(results) if s["attack"] == "none"]
+    assert clean and all(s["mean_ber"] == 0.0 for s in clean)
+
+    tput = throughput(results, wall)
+    assert tput["embed"]["ops"] == 2
+    assert tput["extract"]["ops"] == 2 * len(attacks)
+    # module constants are untouched in the parent process
+    assert (wm_dct.ALPHA, wm_dct.BLOCK) == (8.0, 8)
+
+def test_payload_too_large_is_reported(tmp_path: Path):
+    img = tmp_path / "small.png"; make_png(img, (16, 16))
+    jobs = build_jobs([img], alphas=[8.0], blocks=[8], attacks=build_attacks(), payload=b"too big")
+    results, _ = run_matrix(jobs, workers=1)
+    assert results[0].error and results[0].attacks == []
+
+def test_job_params_passed_without_touching_module_state(tmp_path: Path):
+    img = tmp_path / "in.png"; make_png(img)
+    jobs = build_jobs([img], alphas=[12.0], blocks=[16], attacks=build_attacks(), payload=b"block16")
+    results, _ = run_matrix(jobs, workers=1)  # in-process: any mutation would be visible here
+    assert results[0].error is None and results[0].attacks[0].ber == 0.0
+    assert (wm_dct.ALPHA, wm_dct.BLOCK) == (8.0, 8)
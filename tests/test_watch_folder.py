@@ -0,0 +1,68 @@
+from pathlib import Path
+import sys
+import time
+import pytest
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.crypto.keys import gen_ecc_p256
+from src.crypto.signature import verify_file
+from src.pipeline.watch import Watcher
+from src.watermark import lsb as wm_lsb
+
+def make_png(path: Path, shade: int):
+    Image.new("RGB", (96, 64), (shade, shade, shade)).save(path, "PNG")
+
+def wait_for(cond, timeout=30.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if cond():
+            return True
+        time.sleep(0.05)
+    return False
+
+def test_watch_embeds_signs_and_skips_done(tmp_path: Path):
+    inbox, out = tmp_path / "in", tmp_path / "out"
+    inbox.mkdir()
+    priv, pub = gen_ecc_p256()
+    for i in range(5):
+        make_png(inbox / f"img{i}.png", 100 + i)
+
+    with Watcher(inbox, out, priv, signer="Tester", algo="ecc", workers=2, queue_size=2, interval=0.05) as w:
+        assert wait_for(lambda: w.stats()["processed"] == 5)
+        make_png(inbox / "late.png", 50)
+        assert wait_for(lambda: w.stats()["processed"] == 6)
+        stats = w.stats()
+    assert stats["failed"] == 0 and stats["queue_max"] == 2
+    assert stats["latency_ms"]["max"] >= stats["service_ms"]["mean"] > 0
+
+    for name in ["img0", "img4", "late"]:
+        png, sig = out / f"{name}_wm.png", out / f"{name}_wm.sig"
+        assert verify_file(png, sig.read_bytes(), pub, algo="ecc")
+        assert b'"signer":"Tester"' in wm_lsb.extract(png)
+    assert not list(out.glob(".*.tmp"))
+
+    # restart: finished files are not reprocessed
+    w2 = Watcher(inbox, out, priv, signer="Tester", algo="ecc", workers=1)
+    assert w2.poll_once() == 0 and w2.poll_once() == 0
+
+def test_changed_file_not_requeued_while_in_flight(tmp_path: Path):
+    inbox, out = tmp_path / "in", tmp_path / "out"
+    inbox.mkdir()
+    priv, _ = gen_ecc_p256()
+    src = inbox / "a.png"; make_png(src, 10)
+    w = Watcher(inbox, out, priv, algo="ecc", workers=1)
+    assert w.poll_once() == 0 and w.poll_once() == 1
+    Image.new("RGB", (128, 64), (20, 20, 20)).save(src, "PNG")  # rewritten while queued
+    assert w.poll_once() == 0 and w.poll_once() == 0
+    w._inflight.discard(src)  # the running task finished
+    assert w.poll_once() == 1
+
+def test_rejects_unbounded_queue_and_no_workers(tmp_path: Path):
+    priv, _ = gen_ecc_p256()
+    for kw in ({"queue_size": 0}, {"workers": 0}):
+        with pytest.raises(ValueError):
+            Watcher(tmp_path / "in", tmp_path / "out", priv, **kw)